@@ -0,0 +1,18 @@
+"""Health API endpoints"""
+
+from fastapi import APIRouter
+from app.core.logger import queue_status
+from app.db import schemas
+from app.db.session import pool_status
+
+router = APIRouter()
+
+@router.get("/db", response_model=schemas.DatabasePoolResponse)
+def database_pools():
+    """Retrieve connection pool statistics of the primary, replica and export databases."""
+    return pool_status()
+
+@router.get("/logs", response_model=schemas.LogQueueResponse)
+def log_queue():
+    """Retrieve the backlog and the number of dropped messages of the log queue."""
+    return queue_status()
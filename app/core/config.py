@@ -2,7 +2,6 @@
 
 import os
 from dotenv import load_dotenv
-from web3 import Web3
 
 environment = os.getenv("ENVIRONMENT", "local")
 ENV_FILE = f".env.{environment}"
@@ -13,15 +12,34 @@ else:
     load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
-if not DATABASE_URL:
-    raise ValueError("DATABASE_URL is not set in the environment variables.")
 AES_KEY = os.getenv("AES_KEY")
-if not AES_KEY:
-    raise ValueError("AES_KEY is not set in the environment variables.")
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "-1"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
 PROVIDER_URL = os.getenv("PROVIDER_URL")
+PROVIDER_URLS = [url.strip() for url in os.getenv("PROVIDER_URLS", PROVIDER_URL or "").split(",") if url.strip()]
+PROVIDER_TIMEOUT = float(os.getenv("PROVIDER_TIMEOUT", "10"))
+PROVIDER_COOLDOWN = float(os.getenv("PROVIDER_COOLDOWN", "5"))
+PROVIDER_HEDGE_DELAY = float(os.getenv("PROVIDER_HEDGE_DELAY", "0.5"))
+PROVIDER_READ_WORKERS = int(os.getenv("PROVIDER_READ_WORKERS", "40"))
+PROVIDER_HEDGE_WORKERS = int(os.getenv("PROVIDER_HEDGE_WORKERS", "32"))
+GAS_SAFETY_MARGIN = float(os.getenv("GAS_SAFETY_MARGIN", "0.2"))
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "5000"))
+EXPORT_POOL_SIZE = int(os.getenv("EXPORT_POOL_SIZE", "2"))
+MULTICALL_BATCH_SIZE = int(os.getenv("MULTICALL_BATCH_SIZE", "500"))
 
-def get_web3_provider():
-    """Get a Web3 provider for the Sepolia testnet."""
-    if not PROVIDER_URL:
-        raise ValueError("PROVIDER_URL is not set in the environment variables.")
-    return Web3(Web3.HTTPProvider(PROVIDER_URL))
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+LOG_ENQUEUE = os.getenv("LOG_ENQUEUE", "false").lower() in ("1", "true", "yes")
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "10"))
+
+def validate():
+    """Check that the required settings are present, called on application startup."""
+    if not DATABASE_URL:
+        raise ValueError("DATABASE_URL is not set in the environment variables.")
+    if not AES_KEY:
+        raise ValueError("AES_KEY is not set in the environment variables.")
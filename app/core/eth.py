@@ -1,23 +1,42 @@
 """Ethereum wallet and transaction utilities."""
 
-from eth_account import Account
-from web3 import Web3
-from app.core import config, utils
-from app.core.logger import logger
+from app.core import multicall, utils
+from app.core.gas import gas_estimator
+from app.core.logger import logger, sampled
+from app.core.providers import get_provider_pool
+from app.core.singleflight import rpc_flight
 from app.db import schemas
 
-Account.enable_unaudited_hdwallet_features()
-
 
 def create_wallet():
     """Create a new Ethereum wallet and return address and private key."""
+    from eth_account import Account
+
     acct = Account.create()
     private_key = "0x" + acct.key.hex()
     return acct.address, private_key
 
+def _token_reads(token: str, sender: str, recipient: str) -> tuple[int | None, int | None, int | None]:
+    """Read a token's decimals and the sender and recipient balances in one Multicall3 eth_call.
+
+    Each value is None when it could not be read.
+    """
+    try:
+        results = multicall.aggregate3([
+            multicall.decimals(token),
+            multicall.balance_of(token, sender),
+            multicall.balance_of(token, recipient),
+        ])
+    except Exception as e:
+        logger.warning("Could not read the {} balances: {}", token, e)
+        return None, None, None
+    return tuple(result.value if result.success else None for result in results)
+
 def create_transaction(transaction: schemas.TransactionIn, private_key: str) -> schemas.TransactionOut:
     """Create a new transaction and return the transaction hash."""
-    w3 = config.get_web3_provider()
+    from web3 import Web3
+
+    w3 = get_provider_pool().sticky()
     if not w3.is_connected():
         raise ConnectionError("Failed to connect to the Ethereum provider.")
 
@@ -36,11 +55,12 @@ def create_transaction(transaction: schemas.TransactionIn, private_key: str) ->
     tx = None
     decimals = 18
     if transaction.asset.upper() == "ETH":
-        gas_limit = w3.eth.estimate_gas({
+        gas_key = ("ETH", gas_estimator.recipient_kind(w3, transaction.to_address))
+        gas_limit = gas_estimator.estimate(gas_key, lambda: w3.eth.estimate_gas({
             'from': transaction.from_address,
             'to': transaction.to_address,
             'value': value_wei,
-        })
+        }))
 
         tx = {
             "nonce": nonce,
@@ -53,17 +73,29 @@ def create_transaction(transaction: schemas.TransactionIn, private_key: str) ->
         if not transaction.contract:
             raise ValueError("Contract address is required for ERC20 transactions")
 
-        contract = utils.get_token_contract(transaction.contract)
+        contract = utils.get_token_contract(transaction.contract, w3)
         if not contract:
             raise ValueError("Invalid contract address for ERC20 transaction")
 
-        decimals = contract.functions.decimals().call()
-
-        gas_limit = contract.functions.transfer(transaction.to_address, int(transaction.amount * 10**decimals)).estimate_gas({
+        token_decimals, sender_balance, recipient_balance = _token_reads(
+            contract.address, transaction.from_address, transaction.to_address
+        )
+        decimals = token_decimals if token_decimals is not None else contract.functions.decimals().call()
+        amount = int(transaction.amount * 10**decimals)
+
+        # A cached gas limit skips the simulation, so the sender's token balance is checked here instead.
+        if sender_balance is not None and sender_balance < amount:
+            raise ValueError("Insufficient token balance for the transaction")
+
+        recipient_kind = gas_estimator.token_recipient_kind(w3, transaction.to_address, recipient_balance)
+        gas_key = (contract.address.lower(), recipient_kind) if recipient_kind else None
+        gas_limit = gas_estimator.estimate(gas_key, lambda: contract.functions.transfer(
+            transaction.to_address, amount
+        ).estimate_gas({
             "from": transaction.from_address,
-        })
+        }), use_cache=sender_balance is not None)
 
-        tx = contract.functions.transfer(transaction.to_address, int(transaction.amount * 10**decimals)).build_transaction({
+        tx = contract.functions.transfer(transaction.to_address, amount).build_transaction({
             "nonce": nonce,
             "gas": gas_limit,
             "gasPrice": gas_price,
@@ -73,13 +105,20 @@ def create_transaction(transaction: schemas.TransactionIn, private_key: str) ->
         raise ValueError("Failed to build transaction")
 
     signed_tx = w3.eth.account.sign_transaction(tx, private_key)
-    tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-    receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+    try:
+        tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+    except Exception:
+        gas_estimator.invalidate(gas_key, transaction.to_address)
+        raise
     if receipt.status != 1:
-        logger.error(f"Transaction failed with status {receipt.status}")
+        gas_estimator.invalidate(gas_key, transaction.to_address)
+        logger.error("Transaction failed with status {}", receipt.status)
         raise RuntimeError(f"Transaction failed with status {receipt.status}")
 
-    logger.info(f"Transaction {tx_hash.hex()} created successfully")
+    gas_estimator.observe(gas_key, receipt.gasUsed)
+
+    logger.info("Transaction {} created successfully", tx_hash.hex())
 
     return schemas.TransactionOut(
         hash=tx_hash.hex(),
@@ -90,6 +129,7 @@ def create_transaction(transaction: schemas.TransactionIn, private_key: str) ->
         gas_price=gas_price,
         input_data=tx.get("input", ""),
         receipt_status=receipt.status,
+        block_number=receipt.blockNumber,
         token_contract=transaction.contract,
         token_symbol=transaction.asset.upper(),
         token_decimals=decimals,
@@ -98,21 +138,62 @@ def create_transaction(transaction: schemas.TransactionIn, private_key: str) ->
 
 def get_transaction(tx_hash: str):
     """Get transaction and receipt by hash from Sepolia testnet."""
-    w3 = config.get_web3_provider()
-    if not w3.is_connected():
-        raise ConnectionError("Failed to connect to the Ethereum provider.")
+    pool = get_provider_pool()
+
+    def fetch():
+        tx = pool.read(lambda w3: w3.eth.get_transaction(tx_hash))
+        receipt = pool.read(lambda w3: w3.eth.get_transaction_receipt(tx_hash))
+        return tx, receipt
+
+    return rpc_flight.do(("get_transaction", tx_hash.lower()), fetch)
+
+def get_balances(addresses: list[str], tokens: list[str]) -> list[schemas.WalletBalances]:
+    """Get ETH and ERC20 balances of many addresses with Multicall3 batched reads."""
+    calls = []
+    for token in tokens:
+        calls.extend((multicall.symbol(token), multicall.decimals(token)))
+    for address in addresses:
+        calls.append(multicall.eth_balance(address))
+        calls.extend(multicall.balance_of(token, address) for token in tokens)
+
+    results = iter(multicall.aggregate3(calls))
+
+    metadata = {}
+    for token in tokens:
+        token_symbol, token_decimals = next(results), next(results)
+        metadata[token] = (token_symbol.value, token_decimals.value)
+
+    balances = []
+    for address in addresses:
+        eth_balance = next(results)
+        wallet = schemas.WalletBalances(
+            address=address,
+            eth_raw=str(eth_balance.value) if eth_balance.success else None,
+            eth=utils.from_wei(eth_balance.value) if eth_balance.success else None,
+        )
+        for token in tokens:
+            token_balance = next(results)
+            token_symbol, token_decimals = metadata[token]
+            wallet.tokens.append(schemas.TokenBalance(
+                contract=token,
+                asset=token_symbol,
+                decimals=token_decimals,
+                raw=str(token_balance.value) if token_balance.success else None,
+                balance=utils.from_wei(token_balance.value, token_decimals)
+                    if token_balance.success and token_decimals is not None else None,
+            ))
+        balances.append(wallet)
 
-    tx = w3.eth.get_transaction(tx_hash)
-    receipt = w3.eth.get_transaction_receipt(tx_hash)
-    return tx, receipt
+    return balances
 
 def validate_transaction(tx_data: dict, receipt: dict) -> schemas.ValidateTransactionResponse:
     """Validate the transaction security."""
+    from web3 import Web3
 
     tx_type = None
 
     if not receipt or receipt.get("status") != 1:
-        logger.warning(f"Transaction {tx_data['hash']} failed with status {receipt.status}")
+        logger.warning("Transaction {} failed with status {}", tx_data['hash'], receipt.status)
         return schemas.ValidateTransactionResponse(
             tx_type=tx_type,
             hash=tx_data["hash"].hex(),
@@ -124,7 +205,7 @@ def validate_transaction(tx_data: dict, receipt: dict) -> schemas.ValidateTransa
     transfers: list[schemas.TransferResponse] = []
 
     if not tx_data["input"] and tx_data["value"] > 0:
-        logger.info(f"Transaction {tx_data['hash']} is a simple ETH transfer")
+        logger.info("Transaction {} is a simple ETH transfer", tx_data['hash'])
         transfers.append(schemas.TransferResponse(
             asset="ETH",
             from_address=tx_data["from"],
@@ -136,7 +217,8 @@ def validate_transaction(tx_data: dict, receipt: dict) -> schemas.ValidateTransa
 
     for log in receipt["logs"]:
         if log["topics"][0].hex() != utils.get_transfer_event_signature():
-            logger.info(f"Log {log['transactionHash'].hex()} is not a transfer event, skipping")
+            if sampled("receipt_log_skipped"):
+                logger.info("Log {} is not a transfer event, skipping", log['transactionHash'].hex())
             continue
         try:
             contract_address = log["address"]
@@ -155,14 +237,14 @@ def validate_transaction(tx_data: dict, receipt: dict) -> schemas.ValidateTransa
             ))
             tx_type = "erc20"
         except Exception as e:
-            logger.error(f"Error processing transfer log: {e}")
+            logger.error("Error processing transfer log: {}", e)
             continue
 
     if tx_type is None:
         tx_type = "unknown"
 
     if not transfers:
-        logger.warning(f"Transaction {tx_data['hash']} has no valid ETH or ERC20 transfers")
+        logger.warning("Transaction {} has no valid ETH or ERC20 transfers", tx_data['hash'])
         return schemas.ValidateTransactionResponse(
                     tx_type=tx_type,
                     hash=tx_data["hash"].hex(),
@@ -171,6 +253,6 @@ def validate_transaction(tx_data: dict, receipt: dict) -> schemas.ValidateTransa
                     transfers=[]
                 )
 
-    logger.info(f"Transaction {tx_data['hash']} is valid with type {tx_type}")
+    logger.info("Transaction {} is valid with type {}", tx_data['hash'], tx_type)
 
     return schemas.ValidateTransactionResponse(tx_type=tx_type, hash=tx_data["hash"].hex(), is_valid=True, transfers=transfers)
@@ -0,0 +1,85 @@
+"""Gas limit estimation with a cache per transfer shape."""
+
+import threading
+from app.core import config
+
+ETH_TRANSFER_GAS = 21000
+
+
+class GasEstimator:
+    """Caches gas limits per (asset, recipient kind).
+
+    A plain ETH transfer to an EOA always costs ETH_TRANSFER_GAS. ETH sent to a
+    contract runs that contract's own receive code, so it is simulated every time.
+    ERC20 shapes are simulated once with estimate_gas; the cached value is then
+    raised to the highest gasUsed observed in receipts and a safety margin is
+    applied on top. A failed send drops the cached value so the next send of that
+    shape is simulated again.
+    """
+
+    def __init__(self, margin: float):
+        self.margin = margin
+        self._is_contract: dict[str, bool] = {}
+        self._limits: dict[tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def recipient_kind(self, w3, address: str) -> str:
+        """Classify an address as "contract" or "eoa", with a cached eth_getCode lookup."""
+        address = address.lower()
+        is_contract = self._is_contract.get(address)
+        if is_contract is None:
+            is_contract = len(w3.eth.get_code(w3.to_checksum_address(address))) > 0
+            self._is_contract[address] = is_contract
+        return "contract" if is_contract else "eoa"
+
+    def token_recipient_kind(self, w3, address: str, balance: int | None) -> str | None:
+        """Classify the recipient of an ERC20 transfer from its token balance, telling new holders apart.
+
+        Crediting an address with no balance writes a fresh storage slot, which costs
+        noticeably more gas than crediting an existing holder. Returns None when the
+        balance could not be read, the transfer then has to be simulated.
+        """
+        if balance is None:
+            return None
+        kind = self.recipient_kind(w3, address)
+        return kind if balance > 0 else f"{kind}:new"
+
+    @staticmethod
+    def cacheable(key: tuple[str, str] | None) -> bool:
+        """Tell whether every transfer of a shape costs about the same gas, None being an unknown shape."""
+        return key is not None and key[0] != "ETH"
+
+    def estimate(self, key: tuple[str, str] | None, simulate, use_cache: bool = True) -> int:
+        """Get the gas limit for a transfer shape, calling simulate() on a cache miss or when use_cache is off."""
+        if key == ("ETH", "eoa"):
+            return ETH_TRANSFER_GAS
+        if not self.cacheable(key):
+            return int(simulate() * (1 + self.margin))
+
+        learned = None
+        if use_cache:
+            with self._lock:
+                learned = self._limits.get(key)
+        if learned is None:
+            learned = simulate()
+            with self._lock:
+                learned = self._limits[key] = max(learned, self._limits.get(key, 0))
+        return int(learned * (1 + self.margin))
+
+    def observe(self, key: tuple[str, str] | None, gas_used: int):
+        """Learn from the gasUsed of a successful transaction receipt."""
+        if not self.cacheable(key):
+            return
+        with self._lock:
+            self._limits[key] = max(gas_used, self._limits.get(key, 0))
+
+    def invalidate(self, key: tuple[str, str] | None, recipient: str | None = None):
+        """Forget the cached limit of a shape, and the recipient's code check, after a failed send."""
+        with self._lock:
+            if key is not None:
+                self._limits.pop(key, None)
+            if recipient is not None:
+                self._is_contract.pop(recipient.lower(), None)
+
+
+gas_estimator = GasEstimator(config.GAS_SAFETY_MARGIN)
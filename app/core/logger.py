@@ -1,12 +1,148 @@
 """Logger configuration for the application using Loguru."""
 
+import json
+import queue
 import sys
+import threading
+import time
 from loguru import logger
+from app.core import config
 
-logger.remove()
-logger.add(
-    sys.stdout,
-    level="INFO",
-    format="<green>{time}</green> | <level>{level}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-    colorize=True
+TEXT_FORMAT = (
+    "<green>{time}</green> | <level>{level}</level> | <magenta>{extra[request_id]}</magenta> | "
+    "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
 )
+
+
+class LogSampler:
+    """Per-key token bucket used to rate-limit high-volume log call sites."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, key: str) -> bool:
+        """Return True if a message for the given key may be emitted now."""
+        if self.rate <= 0:
+            return True
+
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(key, (self.rate, now))
+            tokens = min(self.rate, tokens + (now - last) * self.rate)
+            allowed = tokens >= 1
+            self._buckets[key] = (tokens - 1 if allowed else tokens, now)
+        return allowed
+
+
+class QueueSink:
+    """Non-blocking sink that hands formatted messages to a background writer thread.
+
+    Messages are dropped, and counted, when the queue is full so request handlers
+    never stall on stdout backpressure. The writer thread reports new drops with a
+    line of its own once it catches up.
+    """
+
+    def __init__(self, stream, maxsize: int, serialize: bool = False):
+        self.stream = stream
+        self.serialize = serialize
+        self.dropped = 0
+        self._reported = 0
+        self._dropped_lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._thread = threading.Thread(target=self._drain, name="log-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def queued(self) -> int:
+        """Number of messages waiting for the writer thread."""
+        return self._queue.qsize()
+
+    def write(self, message: str):
+        """Enqueue a formatted message without blocking."""
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+    def flush(self):
+        """Writes are flushed by the background thread."""
+
+    def stop(self):
+        """Write the remaining messages and stop the writer thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _drain(self):
+        while True:
+            message = self._queue.get()
+            if message is None:
+                break
+            self.stream.write(message)
+            if self._queue.empty():
+                self._report_drops()
+                self.stream.flush()
+        self._report_drops()
+        self.stream.flush()
+
+    def _report_drops(self):
+        dropped = self.dropped
+        if dropped == self._reported:
+            return
+        notice = f"{dropped - self._reported} log messages dropped, queue full ({dropped} in total)"
+        self._reported = dropped
+        if self.serialize:
+            record = {"level": {"name": "WARNING"}, "message": notice, "extra": {"dropped": dropped}}
+            self.stream.write(json.dumps({"text": notice + "\n", "record": record}) + "\n")
+        else:
+            self.stream.write(notice + "\n")
+
+
+sampler = LogSampler(config.LOG_SAMPLE_RATE)
+
+def sampled(key: str) -> bool:
+    """Check whether a rate-limited log call site identified by key may log."""
+    return sampler.allow(key)
+
+_queue_sink: QueueSink | None = None
+
+def setup_logger():
+    """Configure the application sinks from the LOG_* settings, replacing any previous ones."""
+    global _queue_sink, sampler
+
+    logger.remove()
+    if _queue_sink is not None:
+        _queue_sink.stop()
+        _queue_sink = None
+    logger.configure(extra={"request_id": "-"})
+    sampler = LogSampler(config.LOG_SAMPLE_RATE)
+
+    sink = sys.stdout
+    if config.LOG_ENQUEUE:
+        _queue_sink = QueueSink(sys.stdout, config.LOG_QUEUE_SIZE, serialize=config.LOG_FORMAT == "json")
+        sink = _queue_sink
+
+    if config.LOG_FORMAT == "json":
+        logger.add(sink, level=config.LOG_LEVEL, serialize=True)
+    else:
+        logger.add(sink, level=config.LOG_LEVEL, format=TEXT_FORMAT, colorize=True)
+
+def queue_status() -> dict:
+    """Get the backlog and drop count of the queue sink, if one is configured."""
+    if _queue_sink is None:
+        return {"enqueue": False, "queued": 0, "dropped": 0}
+    return {"enqueue": True, "queued": _queue_sink.queued, "dropped": _queue_sink.dropped}
+
+def shutdown_logger():
+    """Flush pending messages of the queue sink, if one is configured."""
+    global _queue_sink
+
+    if _queue_sink is None:
+        return
+    logger.remove()
+    _queue_sink.stop()
+    _queue_sink = None
+
+setup_logger()
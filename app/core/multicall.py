@@ -0,0 +1,92 @@
+"""Batch contract reads through the Multicall3 contract."""
+
+from typing import Any, NamedTuple
+from app.core import config
+from app.core.providers import get_provider_pool
+from app.core.singleflight import rpc_flight
+
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+AGGREGATE3_SELECTOR = bytes.fromhex("82ad56cb")
+BALANCE_OF_SELECTOR = bytes.fromhex("70a08231")
+DECIMALS_SELECTOR = bytes.fromhex("313ce567")
+SYMBOL_SELECTOR = bytes.fromhex("95d89b41")
+GET_ETH_BALANCE_SELECTOR = bytes.fromhex("4d2301cc")
+
+
+class Call(NamedTuple):
+    """A single contract read: target address, calldata and the ABI types of its output."""
+    target: str
+    data: bytes
+    output_types: tuple[str, ...]
+
+
+class Result(NamedTuple):
+    """Outcome of a single call; value is None when the call reverted or could not be decoded."""
+    success: bool
+    value: Any
+
+
+def call_contract(target: str, data: bytes) -> bytes:
+    """Run an eth_call, sharing the upstream request with identical calls in flight."""
+    return rpc_flight.do(
+        ("eth_call", target.lower(), data),
+        lambda: get_provider_pool().read(lambda w3: w3.eth.call({"to": target, "data": data})),
+    )
+
+def _encode_address_call(selector: bytes, address: str) -> bytes:
+    from eth_abi import encode
+
+    return selector + encode(["address"], [address])
+
+def eth_balance(owner: str) -> Call:
+    """Build a call reading the ETH balance of owner through Multicall3."""
+    return Call(MULTICALL3_ADDRESS, _encode_address_call(GET_ETH_BALANCE_SELECTOR, owner), ("uint256",))
+
+def balance_of(token: str, owner: str) -> Call:
+    """Build a call reading the ERC20 balance of owner."""
+    return Call(token, _encode_address_call(BALANCE_OF_SELECTOR, owner), ("uint256",))
+
+def decimals(token: str) -> Call:
+    """Build a call reading the ERC20 decimals."""
+    return Call(token, DECIMALS_SELECTOR, ("uint8",))
+
+def symbol(token: str) -> Call:
+    """Build a call reading the ERC20 symbol."""
+    return Call(token, SYMBOL_SELECTOR, ("string",))
+
+def _aggregate3_batch(calls: list[Call]) -> list[Result]:
+    from eth_abi import decode, encode
+
+    payload = AGGREGATE3_SELECTOR + encode(
+        ["(address,bool,bytes)[]"],
+        [[(call.target, True, call.data) for call in calls]],
+    )
+    raw = call_contract(MULTICALL3_ADDRESS, payload)
+    (returned,) = decode(["(bool,bytes)[]"], raw)
+
+    results = []
+    for call, (success, data) in zip(calls, returned):
+        if not success:
+            results.append(Result(False, None))
+            continue
+        try:
+            values = decode(list(call.output_types), data)
+        except Exception:
+            results.append(Result(False, None))
+            continue
+        results.append(Result(True, values[0] if len(values) == 1 else values))
+    return results
+
+def aggregate3(calls: list[Call], batch_size: int | None = None) -> list[Result]:
+    """Run many contract reads with Multicall3 aggregate3, one eth_call per batch.
+
+    Every call is sent with allowFailure set, so a reverting call only fails its
+    own result. Results are returned in the order of calls.
+    """
+    batch_size = batch_size or config.MULTICALL_BATCH_SIZE
+
+    results: list[Result] = []
+    for start in range(0, len(calls), batch_size):
+        results.extend(_aggregate3_batch(calls[start:start + batch_size]))
+    return results
@@ -0,0 +1,210 @@
+"""Pool of Ethereum RPC providers with health scoring, failover and hedged reads."""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
+from urllib.parse import urlsplit
+from app.core import config
+from app.core.logger import logger
+
+LATENCY_ALPHA = 0.2
+DEFAULT_LATENCY = 0.5
+MAX_COOLDOWN_FACTOR = 8
+
+
+def _is_provider_failure(exc: Exception) -> bool:
+    """Tell transport and node failures apart from errors about the request itself."""
+    from requests import RequestException
+    from web3 import exceptions
+
+    return isinstance(exc, (
+        RequestException,
+        ConnectionError,
+        TimeoutError,
+        exceptions.ProviderConnectionError,
+        exceptions.TooManyRequests,
+        exceptions.RequestTimedOut,
+        exceptions.BadResponseFormat,
+        exceptions.CannotHandleRequest,
+    ))
+
+
+def _is_not_found(exc: Exception) -> bool:
+    """Tell not-found answers apart, which a node lagging behind the others may give."""
+    from web3 import exceptions
+
+    return isinstance(exc, (exceptions.TransactionNotFound, exceptions.BlockNotFound))
+
+def _read_failed(last_error: Exception | None, not_found: Exception | None):
+    """Raise the outcome of a read no endpoint answered: not found if any node said so."""
+    if not_found is not None:
+        raise not_found
+    raise ConnectionError("Failed to connect to the Ethereum provider.") from last_error
+
+
+class Endpoint:
+    """A single RPC endpoint and its health statistics."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.name = urlsplit(url).netloc or url
+        self.latency: float | None = None
+        self.errors = 0.0
+        self.down_until = 0.0
+        self._w3 = None
+        self._lock = threading.Lock()
+
+    @property
+    def w3(self):
+        """Get the Web3 client of this endpoint, created on first use."""
+        if self._w3 is None:
+            from web3 import Web3
+
+            self._w3 = Web3(Web3.HTTPProvider(self.url, request_kwargs={"timeout": config.PROVIDER_TIMEOUT}))
+        return self._w3
+
+    def score(self, now: float) -> float:
+        """Lower is healthier: latency weighted by recent errors, infinite while cooling down."""
+        if now < self.down_until:
+            return float("inf")
+        latency = self.latency if self.latency is not None else DEFAULT_LATENCY
+        return latency * (1 + self.errors)
+
+    def record_success(self, elapsed: float):
+        """Update the latency moving average after a completed request."""
+        with self._lock:
+            if self.latency is None:
+                self.latency = elapsed
+            else:
+                self.latency = LATENCY_ALPHA * elapsed + (1 - LATENCY_ALPHA) * self.latency
+            self.errors /= 2
+
+    def record_failure(self):
+        """Penalize the endpoint and take it out of rotation for a growing cooldown."""
+        with self._lock:
+            self.errors += 1
+            factor = min(self.errors, MAX_COOLDOWN_FACTOR)
+            self.down_until = time.monotonic() + config.PROVIDER_COOLDOWN * factor
+
+
+class ProviderPool:
+    """Routes RPC calls to the healthiest endpoint.
+
+    Reads fail over to the next endpoint on provider failures and may be hedged:
+    if the first endpoint has not answered hedge_delay seconds after the read
+    started, the same read is sent to the second one and the first answer wins.
+    Hedges run on workers of their own and are skipped when none is free. A
+    not-found answer is only final once the other endpoints had their say.
+    Writes use sticky().
+    """
+
+    def __init__(self, urls: list[str], hedge_delay: float):
+        if not urls:
+            raise ValueError("PROVIDER_URL is not set in the environment variables.")
+        self.endpoints = [Endpoint(url) for url in urls]
+        self.hedge_delay = hedge_delay
+        self._readers = ThreadPoolExecutor(max_workers=config.PROVIDER_READ_WORKERS, thread_name_prefix="rpc-read")
+        self._hedgers = ThreadPoolExecutor(max_workers=config.PROVIDER_HEDGE_WORKERS, thread_name_prefix="rpc-hedge")
+        self._hedge_slots = threading.BoundedSemaphore(config.PROVIDER_HEDGE_WORKERS)
+
+    def ranked(self) -> list[Endpoint]:
+        """Get the endpoints ordered from healthiest to least healthy."""
+        now = time.monotonic()
+        return sorted(self.endpoints, key=lambda endpoint: endpoint.score(now))
+
+    def sticky(self):
+        """Get the Web3 client of the healthiest endpoint, for flows that must stay on one node."""
+        return self.ranked()[0].w3
+
+    def read(self, fn, hedge: bool = True):
+        """Run an idempotent read, fn(w3), with failover and optional hedging."""
+        ranked = self.ranked()
+        if not hedge or self.hedge_delay <= 0 or len(ranked) < 2:
+            return self._failover(fn, ranked)
+
+        remaining = iter(ranked[1:])
+        started = threading.Event()
+        pending = {self._readers.submit(self._attempt, ranked[0], fn, started)}
+        # Waiting for a free reader is not provider latency, so the hedge clock starts with the attempt.
+        started.wait()
+        hedged = False
+        last_error = not_found = None
+        while pending:
+            timeout = None if hedged else self.hedge_delay
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                hedged = True
+                hedge_future = self._hedge(remaining, fn)
+                if hedge_future is not None:
+                    pending.add(hedge_future)
+                continue
+
+            for future in done:
+                exc = future.exception()
+                if exc is None:
+                    return future.result()
+                if _is_not_found(exc):
+                    not_found = exc
+                    if pending:
+                        continue
+                elif _is_provider_failure(exc):
+                    last_error = exc
+                else:
+                    raise exc
+                endpoint = next(remaining, None)
+                if endpoint is not None:
+                    pending.add(self._readers.submit(self._attempt, endpoint, fn))
+
+        _read_failed(last_error, not_found)
+
+    def _hedge(self, remaining, fn):
+        """Send the read to the next endpoint if a hedge worker is free."""
+        if not self._hedge_slots.acquire(blocking=False):
+            logger.debug("Read not hedged, all {} hedge workers are busy", config.PROVIDER_HEDGE_WORKERS)
+            return None
+        endpoint = next(remaining, None)
+        if endpoint is None:
+            self._hedge_slots.release()
+            return None
+        logger.debug("Hedging read to {} after {}s without answer", endpoint.name, self.hedge_delay)
+        future = self._hedgers.submit(self._attempt, endpoint, fn)
+        future.add_done_callback(lambda _: self._hedge_slots.release())
+        return future
+
+    def _failover(self, fn, endpoints: list[Endpoint]):
+        last_error = not_found = None
+        for endpoint in endpoints:
+            try:
+                return self._attempt(endpoint, fn)
+            except Exception as e:
+                if _is_not_found(e):
+                    not_found = e
+                elif _is_provider_failure(e):
+                    last_error = e
+                else:
+                    raise
+        _read_failed(last_error, not_found)
+
+    @staticmethod
+    def _attempt(endpoint: Endpoint, fn, started: threading.Event | None = None):
+        if started is not None:
+            started.set()
+        start = time.monotonic()
+        try:
+            result = fn(endpoint.w3)
+        except Exception as e:
+            if _is_provider_failure(e):
+                logger.warning("Provider {} failed: {}", endpoint.name, e)
+                endpoint.record_failure()
+            else:
+                endpoint.record_success(time.monotonic() - start)
+            raise
+        endpoint.record_success(time.monotonic() - start)
+        return result
+
+
+@lru_cache
+def get_provider_pool() -> ProviderPool:
+    """Get the application provider pool built from PROVIDER_URLS."""
+    return ProviderPool(config.PROVIDER_URLS, config.PROVIDER_HEDGE_DELAY)
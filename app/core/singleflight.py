@@ -0,0 +1,55 @@
+"""Single-flight coalescing of identical in-flight calls."""
+
+import threading
+from typing import Any, Hashable
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Runs a function once per key among concurrent callers.
+
+    The first caller for a key executes the function; callers arriving while it is
+    in flight wait and receive the same result or exception. Nothing is cached once
+    the call completes.
+    """
+
+    def __init__(self):
+        self.shared = 0
+        self._calls: dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn):
+        """Run fn() for key, or wait for the call already in flight for it."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+rpc_flight = SingleFlight()
@@ -1,8 +1,10 @@
 """Aplication utility functions."""
 
 import base64
-from Crypto.Cipher import AES
+from functools import lru_cache
 from app.core import config
+from app.core.providers import get_provider_pool
+from app.core.singleflight import rpc_flight
 
 
 def encrypt_private_key(private_key_hex: str) -> str:
@@ -10,6 +12,8 @@ def encrypt_private_key(private_key_hex: str) -> str:
     if not private_key_hex.startswith("0x"):
         raise ValueError("Private key must start with 0x")
 
+    from Crypto.Cipher import AES
+
     aes_key = bytes.fromhex(config.AES_KEY)
     cipher = AES.new(aes_key, AES.MODE_EAX)
     ciphertext, tag = cipher.encrypt_and_digest(bytes.fromhex(private_key_hex[2:]))
@@ -17,6 +21,8 @@ def encrypt_private_key(private_key_hex: str) -> str:
 
 def decrypt_private_key(encrypted_key: str) -> str:
     """Decrypt the private key using AES decryption."""
+    from Crypto.Cipher import AES
+
     aes_key = bytes.fromhex(config.AES_KEY)
     encrypted_data = base64.b64decode(encrypted_key)
 
@@ -32,31 +38,30 @@ def decrypt_private_key(encrypted_key: str) -> str:
 def get_token_metadata(contract_address: str) -> tuple[str, int]:
     """Get token metadata (symbol and decimals) from the contract address."""
 
-    w3 = config.get_web3_provider()
-    if not w3.is_connected():
-        raise ConnectionError("Failed to connect to the Ethereum provider.")
-
     abi = [
         {"name": "symbol", "outputs": [{"type": "string"}], "inputs": [], "stateMutability": "view", "type": "function"},
         {"name": "decimals", "outputs": [{"type": "uint8"}], "inputs": [], "stateMutability": "view", "type": "function"},
     ]
-    contract = w3.eth.contract(address=contract_address, abi=abi)
-    symbol = contract.functions.symbol().call()
-    decimals = contract.functions.decimals().call()
-    return symbol, decimals
+
+    def read(w3):
+        contract = w3.eth.contract(address=contract_address, abi=abi)
+        return contract.functions.symbol().call(), contract.functions.decimals().call()
+
+    return rpc_flight.do(
+        ("token_metadata", contract_address.lower()),
+        lambda: get_provider_pool().read(read),
+    )
 
 def from_wei(value: int, decimals: int = 18) -> str:
     """Convert value from wei to a human-readable format."""
     return str(value / 10**decimals)
 
+@lru_cache
 def get_transfer_event_signature() -> str:
     """Get the signature for the ERC20 Transfer event."""
+    from web3 import Web3
 
-    w3 = config.get_web3_provider()
-    if not w3.is_connected():
-        raise ConnectionError("Failed to connect to the Ethereum provider.")
-
-    return w3.keccak(text="Transfer(address,address,uint256)").hex()
+    return Web3.keccak(text="Transfer(address,address,uint256)").hex()
 
 ERC20_ABI = [
     {
@@ -78,12 +83,14 @@ ERC20_ABI = [
     },
 ]
 
-def get_token_contract(token_address: str):
-    """Get the token contract instance for the given address."""
+def get_token_contract(token_address: str, w3=None):
+    """Get the token contract instance for the given address.
+
+    The contract is bound to w3 when given, to the healthiest provider otherwise.
+    """
 
-    w3 = config.get_web3_provider()
-    if not w3.is_connected():
-        raise ConnectionError("Failed to connect to the Ethereum provider.")
+    if w3 is None:
+        w3 = get_provider_pool().sticky()
 
     token_address = w3.to_checksum_address(token_address)
     return w3.eth.contract(address=token_address, abi=ERC20_ABI)
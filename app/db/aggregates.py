@@ -0,0 +1,86 @@
+"""Rebuild of the per-address aggregates table from the transfers history.
+
+Usage: python -m app.db.aggregates rebuild
+"""
+
+import argparse
+from sqlalchemy import Numeric, and_, case, cast, delete, func, insert, literal, select, text, union_all
+from sqlalchemy.orm import Session
+from app.core import config
+from app.core.logger import logger
+from app.db import models
+from app.db.session import SessionLocal, init_db
+
+
+def _asset():
+    """SQL version of persistence.aggregate_asset."""
+    is_token = and_(
+        models.Transaction.transaction_type == "erc20",
+        models.Transaction.token_contract.isnot(None),
+        models.Transaction.token_contract != "",
+    )
+    return case((is_token, func.lower(models.Transaction.token_contract)), else_=func.upper(models.Transfer.asset))
+
+def _side(address_column, received: bool):
+    value = cast(models.Transfer.value, Numeric(78, 18))
+    zero = literal(0)
+    address, asset = func.lower(address_column), _asset()
+    return (
+        select(
+            address.label("address"),
+            asset.label("asset"),
+            (func.sum(value) if received else zero).label("received_total"),
+            (func.count() if received else zero).label("received_count"),
+            (zero if received else func.sum(value)).label("sent_total"),
+            (zero if received else func.count()).label("sent_count"),
+            func.max(models.Transaction.block_number).label("last_block"),
+        )
+        .join(models.Transaction, models.Transfer.transaction_id == models.Transaction.id)
+        .group_by(address, asset)
+    )
+
+def rebuild(db: Session) -> int:
+    """Recompute address_aggregates from transfers in a single statement.
+
+    On PostgreSQL the table is locked for writes meanwhile, so transfers ingested
+    concurrently are added on top of the rebuilt totals instead of being lost.
+    The caller must commit. Returns the number of aggregate rows written.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("LOCK TABLE address_aggregates IN EXCLUSIVE MODE"))
+
+    db.execute(delete(models.AddressAggregate))
+
+    sides = union_all(
+        _side(models.Transfer.to_address, received=True),
+        _side(models.Transfer.from_address, received=False),
+    ).subquery()
+    totals = select(
+        sides.c.address,
+        sides.c.asset,
+        func.sum(sides.c.received_total),
+        func.sum(sides.c.received_count),
+        func.sum(sides.c.sent_total),
+        func.sum(sides.c.sent_count),
+        func.max(sides.c.last_block),
+    ).group_by(sides.c.address, sides.c.asset)
+
+    columns = ["address", "asset", "received_total", "received_count", "sent_total", "sent_count", "last_block"]
+    result = db.execute(insert(models.AddressAggregate).from_select(columns, totals))
+    return result.rowcount
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Maintain the address_aggregates table.")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.parse_args()
+
+    config.validate()
+    init_db()
+    with SessionLocal() as db:
+        rows = rebuild(db)
+        db.commit()
+    logger.info("Rebuilt {} address aggregates from transfers", rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""Streaming export of the transaction history joined with its transfers.
+
+Usage: python -m app.db.export --format csv --output history.csv [--start-id N] [--end-id N]
+                                [--since ISO-8601] [--until ISO-8601]
+"""
+
+import argparse
+import csv
+import io
+import sys
+from datetime import datetime
+from typing import Iterator
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.core import config
+from app.core.logger import logger
+from app.db import models
+from app.db.session import ExportSessionLocal, init_db
+
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+EXPORT_COLUMNS = (
+    models.Transaction.id.label("transaction_id"),
+    models.Transaction.hash,
+    models.Transaction.block_number,
+    models.Transaction.created_at,
+    models.Transaction.transaction_type,
+    models.Transaction.receipt_status,
+    models.Transaction.gas,
+    models.Transaction.gas_price,
+    models.Transaction.token_contract,
+    models.Transfer.id.label("transfer_id"),
+    models.Transfer.asset,
+    models.Transfer.from_address,
+    models.Transfer.to_address,
+    models.Transfer.value,
+    models.Transfer.decimals,
+)
+EXPORT_KEYS = tuple(column.key for column in EXPORT_COLUMNS)
+
+
+def iter_partitions(
+    db: Session,
+    start_id: int | None = None,
+    end_id: int | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> Iterator[list[tuple]]:
+    """Stream the export rows in partitions of EXPORT_BATCH_SIZE through a server-side cursor.
+
+    Ranges are inclusive on the start and exclusive on the end.
+    """
+    stmt = (
+        select(*EXPORT_COLUMNS)
+        .join(models.Transfer, models.Transfer.transaction_id == models.Transaction.id)
+        .order_by(models.Transaction.id, models.Transfer.id)
+        .execution_options(yield_per=config.EXPORT_BATCH_SIZE)
+    )
+    if start_id is not None:
+        stmt = stmt.where(models.Transaction.id >= start_id)
+    if end_id is not None:
+        stmt = stmt.where(models.Transaction.id < end_id)
+    if since is not None:
+        stmt = stmt.where(models.Transaction.created_at >= since)
+    if until is not None:
+        stmt = stmt.where(models.Transaction.created_at < until)
+
+    for partition in db.execute(stmt).partitions():
+        yield partition
+
+def _ndjson(partitions: Iterator[list[tuple]]) -> Iterator[bytes]:
+    import orjson
+
+    for rows in partitions:
+        yield b"".join(orjson.dumps(dict(zip(EXPORT_KEYS, row))) + b"\n" for row in rows)
+
+def _csv(partitions: Iterator[list[tuple]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_KEYS)
+    for rows in partitions:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object collecting what the Parquet writer emits between drains."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        """Return and forget the bytes written since the previous drain."""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _parquet(partitions: Iterator[list[tuple]]) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("transaction_id", pa.int64()),
+        ("hash", pa.string()),
+        ("block_number", pa.int64()),
+        ("created_at", pa.timestamp("us", tz="UTC")),
+        ("transaction_type", pa.string()),
+        ("receipt_status", pa.int32()),
+        ("gas", pa.int64()),
+        ("gas_price", pa.int64()),
+        ("token_contract", pa.string()),
+        ("transfer_id", pa.int64()),
+        ("asset", pa.string()),
+        ("from_address", pa.string()),
+        ("to_address", pa.string()),
+        ("value", pa.string()),
+        ("decimals", pa.int32()),
+    ])
+
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+        for rows in partitions:
+            columns = list(zip(*rows))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                schema=schema,
+            ))
+            yield sink.drain()
+    yield sink.drain()
+
+WRITERS = {"ndjson": _ndjson, "csv": _csv, "parquet": _parquet}
+
+def open_session() -> Session:
+    """Open a session on the export pool with its connection already checked out.
+
+    Raises sqlalchemy.exc.TimeoutError when EXPORT_POOL_SIZE exports are already running.
+    """
+    db = ExportSessionLocal()
+    try:
+        db.connection()
+    except Exception:
+        db.close()
+        raise
+    return db
+
+def stream_export(db: Session, export_format: str, **filters) -> Iterator[bytes]:
+    """Encode the transaction history in the given format, in constant memory.
+
+    Takes ownership of db, which is closed once the stream is exhausted or closed early.
+    """
+    try:
+        yield from WRITERS[export_format](iter_partitions(db, **filters))
+    finally:
+        db.close()
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Export transactions joined with their transfers.")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="ndjson")
+    parser.add_argument("--output", help="File to write, stdout when omitted")
+    parser.add_argument("--start-id", type=int)
+    parser.add_argument("--end-id", type=int)
+    parser.add_argument("--since", type=datetime.fromisoformat)
+    parser.add_argument("--until", type=datetime.fromisoformat)
+    args = parser.parse_args()
+
+    config.validate()
+    init_db()
+
+    chunks = stream_export(
+        open_session(),
+        args.format,
+        start_id=args.start_id,
+        end_id=args.end_id,
+        since=args.since,
+        until=args.until,
+    )
+    if not args.output:
+        for chunk in chunks:
+            sys.stdout.buffer.write(chunk)
+        return
+
+    with open(args.output, "wb") as output:
+        for chunk in chunks:
+            output.write(chunk)
+    logger.info("Export written to {}", args.output)
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 """Database models for the application using SQLAlchemy."""
 
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, DateTime, Integer, String, ForeignKey, Numeric, func
 from sqlalchemy.orm import relationship
 from app.db.session import Base
 
@@ -29,6 +29,8 @@ class Transaction(Base):
     token_symbol = Column(String, nullable=True)
     token_decimals = Column(Integer, nullable=True)
     transaction_type = Column(String, nullable=False, default="eth")
+    block_number = Column(Integer, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), index=True)
 
     transfers= relationship("Transfer", back_populates="transaction")
 
@@ -45,3 +47,15 @@ class Transfer(Base):
     decimals = Column(Integer, nullable=False)
 
     transaction = relationship("Transaction", back_populates="transfers")
+
+class AddressAggregate(Base):
+    """Model representing the running totals of an asset sent and received by an address."""
+    __tablename__ = "address_aggregates"
+
+    address = Column(String, primary_key=True)
+    asset = Column(String, primary_key=True)
+    received_total = Column(Numeric(78, 18), nullable=False, default=0)
+    received_count = Column(Integer, nullable=False, default=0)
+    sent_total = Column(Numeric(78, 18), nullable=False, default=0)
+    sent_count = Column(Integer, nullable=False, default=0)
+    last_block = Column(Integer, nullable=True)
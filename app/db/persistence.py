@@ -0,0 +1,163 @@
+"""Bulk persistence of transactions and their transfers."""
+
+from decimal import Decimal
+from sqlalchemy import func, literal_column
+from sqlalchemy.orm import Session
+from app.db import models
+
+BATCH_SIZE = 1000
+
+TRANSACTION_FIELDS = (
+    "hash",
+    "from_address",
+    "to_address",
+    "value",
+    "gas",
+    "gas_price",
+    "input_data",
+    "receipt_status",
+    "token_contract",
+    "token_symbol",
+    "token_decimals",
+    "transaction_type",
+    "block_number",
+)
+
+TRANSFER_FIELDS = ("asset", "from_address", "to_address", "value", "decimals")
+
+
+def _insert(db: Session, table):
+    """Get the dialect specific insert construct, which supports ON CONFLICT."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise NotImplementedError(f"Bulk upsert is not supported for the {dialect} dialect")
+    return insert(table), dialect
+
+def upsert_transactions(
+    db: Session,
+    items: list[tuple[dict, list[dict]]],
+    update: bool = False,
+) -> dict[str, int]:
+    """Write transactions and their transfers with one statement per table and batch.
+
+    Each item is a (transaction, transfers) pair of column dicts. Transactions are
+    inserted with ON CONFLICT (hash) DO NOTHING, or DO UPDATE when update is set
+    (PostgreSQL only), and transfers are inserted only for transactions that did not
+    exist yet, together with the matching address_aggregates updates. The caller owns
+    the database transaction and must commit.
+
+    Returns the ids of the newly inserted transactions by hash.
+    """
+    unique = {transaction["hash"]: (transaction, transfers) for transaction, transfers in items}
+    items = list(unique.values())
+
+    inserted_ids: dict[str, int] = {}
+    for start in range(0, len(items), BATCH_SIZE):
+        inserted_ids.update(_upsert_batch(db, items[start:start + BATCH_SIZE], update))
+    return inserted_ids
+
+def _upsert_batch(db: Session, items: list[tuple[dict, list[dict]]], update: bool) -> dict[str, int]:
+    stmt, dialect = _insert(db, models.Transaction)
+    stmt = stmt.values([
+        {field: transaction.get(field) for field in TRANSACTION_FIELDS}
+        for transaction, _ in items
+    ])
+
+    if update:
+        if dialect != "postgresql":
+            raise NotImplementedError("Upserting existing transactions requires PostgreSQL")
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[models.Transaction.hash],
+            set_={field: stmt.excluded[field] for field in TRANSACTION_FIELDS if field != "hash"},
+        ).returning(models.Transaction.id, models.Transaction.hash, literal_column("xmax = 0"))
+    else:
+        stmt = stmt.on_conflict_do_nothing(
+            index_elements=[models.Transaction.hash],
+        ).returning(models.Transaction.id, models.Transaction.hash, literal_column("1"))
+
+    inserted_ids = {tx_hash: tx_id for tx_id, tx_hash, inserted in db.execute(stmt) if inserted}
+
+    transfer_rows = [
+        {"transaction_id": inserted_ids[transaction["hash"]], **{field: transfer[field] for field in TRANSFER_FIELDS}}
+        for transaction, transfers in items
+        if transaction["hash"] in inserted_ids
+        for transfer in transfers
+    ]
+    for start in range(0, len(transfer_rows), BATCH_SIZE):
+        db.execute(_insert(db, models.Transfer)[0].values(transfer_rows[start:start + BATCH_SIZE]))
+
+    _update_aggregates(db, [
+        (transfer, transaction)
+        for transaction, transfers in items
+        if transaction["hash"] in inserted_ids
+        for transfer in transfers
+    ])
+
+    return inserted_ids
+
+def aggregate_asset(asset: str, transaction: dict) -> str:
+    """Get the asset key of a transfer in address_aggregates: the token contract for ERC20, the upper-cased asset otherwise.
+
+    Mirrored in SQL by app.db.aggregates, keep both in sync.
+    """
+    if transaction.get("transaction_type") == "erc20" and transaction.get("token_contract"):
+        return transaction["token_contract"].lower()
+    return asset.upper()
+
+def _update_aggregates(db: Session, transfers: list[tuple[dict, dict]]):
+    """Add newly inserted transfers to the per (address, asset) running totals.
+
+    Addresses are keyed lower-cased, so one account maps to one row however it was written.
+    """
+    deltas: dict[tuple[str, str], dict] = {}
+
+    def delta(address: str, asset: str) -> dict:
+        return deltas.setdefault((address, asset), {
+            "address": address,
+            "asset": asset,
+            "received_total": Decimal(0),
+            "received_count": 0,
+            "sent_total": Decimal(0),
+            "sent_count": 0,
+            "last_block": None,
+        })
+
+    for transfer, transaction in transfers:
+        value = Decimal(transfer["value"])
+        asset = aggregate_asset(transfer["asset"], transaction)
+        block_number = transaction.get("block_number")
+        for side, address in (("received", transfer["to_address"]), ("sent", transfer["from_address"])):
+            row = delta(address.lower(), asset)
+            row[f"{side}_total"] += value
+            row[f"{side}_count"] += 1
+            if block_number is not None:
+                row["last_block"] = max(row["last_block"] or 0, block_number)
+
+    # Sorted so concurrent writers lock the aggregate rows in the same order.
+    rows = [deltas[key] for key in sorted(deltas)]
+    for start in range(0, len(rows), BATCH_SIZE):
+        db.execute(_upsert_aggregates(db, rows[start:start + BATCH_SIZE]))
+
+def _upsert_aggregates(db: Session, rows: list[dict]):
+    stmt, dialect = _insert(db, models.AddressAggregate)
+    stmt = stmt.values(rows)
+    table, excluded = models.AddressAggregate, stmt.excluded
+    greatest = func.greatest if dialect == "postgresql" else func.max
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.address, table.asset],
+        set_={
+            "received_total": table.received_total + excluded.received_total,
+            "received_count": table.received_count + excluded.received_count,
+            "sent_total": table.sent_total + excluded.sent_total,
+            "sent_count": table.sent_count + excluded.sent_count,
+            "last_block": greatest(
+                func.coalesce(table.last_block, excluded.last_block),
+                func.coalesce(excluded.last_block, table.last_block),
+            ),
+        },
+    )
+    return stmt
@@ -0,0 +1,90 @@
+"""Column-level read queries that skip ORM object and pydantic model construction."""
+
+from decimal import Decimal
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+from app.db import models
+
+TRANSACTION_COLUMNS = (
+    models.Transaction.id,
+    models.Transaction.hash,
+    models.Transaction.from_address,
+    models.Transaction.to_address,
+    models.Transaction.value,
+    models.Transaction.gas,
+    models.Transaction.gas_price,
+    models.Transaction.input_data,
+    models.Transaction.receipt_status,
+    models.Transaction.token_contract,
+    models.Transaction.token_symbol,
+    models.Transaction.token_decimals,
+    models.Transaction.transaction_type,
+    models.Transaction.block_number,
+)
+
+TRANSFER_COLUMNS = (
+    models.Transfer.asset,
+    models.Transfer.from_address,
+    models.Transfer.to_address,
+    models.Transfer.value,
+    models.Transfer.decimals,
+)
+TRANSFER_KEYS = tuple(column.key for column in TRANSFER_COLUMNS)
+
+
+def account_transactions(db: Session, address: str) -> list[dict]:
+    """Get the transactions of an address with their transfers, shaped like schemas.TransactionOut."""
+    account_filter = or_(
+        models.Transaction.from_address == address,
+        models.Transaction.to_address == address,
+    )
+
+    transactions = {}
+    for row in db.execute(select(*TRANSACTION_COLUMNS).where(account_filter).order_by(models.Transaction.id)):
+        transaction = row._asdict()
+        transaction["transfers"] = []
+        transactions[row.id] = transaction
+
+    if transactions:
+        transfer_rows = db.execute(
+            select(models.Transfer.transaction_id, *TRANSFER_COLUMNS)
+            .join(models.Transaction, models.Transfer.transaction_id == models.Transaction.id)
+            .where(account_filter)
+            .order_by(models.Transfer.id)
+        )
+        for transaction_id, *transfer in transfer_rows:
+            transactions[transaction_id]["transfers"].append(dict(zip(TRANSFER_KEYS, transfer)))
+
+    return list(transactions.values())
+
+def address_summary(db: Session, address: str) -> list[dict]:
+    """Get the aggregated totals per asset of an address, in any letter case, shaped like schemas.AssetSummary."""
+    rows = db.execute(
+        select(
+            models.AddressAggregate.asset,
+            models.AddressAggregate.received_total,
+            models.AddressAggregate.received_count,
+            models.AddressAggregate.sent_total,
+            models.AddressAggregate.sent_count,
+            models.AddressAggregate.last_block,
+        )
+        .where(models.AddressAggregate.address == address.lower())
+        .order_by(models.AddressAggregate.asset)
+    )
+    return [
+        {
+            **row._asdict(),
+            "received_total": _format_decimal(row.received_total),
+            "sent_total": _format_decimal(row.sent_total),
+        }
+        for row in rows
+    ]
+
+def _format_decimal(value) -> str:
+    return format(Decimal(value).normalize(), "f")
+
+def wallets(db: Session) -> list[tuple[int, str, str]]:
+    """Get the id, address and encrypted private key of every wallet."""
+    return db.execute(
+        select(models.Wallet.id, models.Wallet.address, models.Wallet.private_key)
+    ).all()
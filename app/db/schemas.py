@@ -16,6 +16,25 @@ class WalletCreateResponse(BaseModel):
     message: str
     addresses: list[str]
 
+class TokenBalance(BaseModel):
+    """Schema for an ERC20 balance of a wallet."""
+    contract: str
+    asset: str | None = None
+    decimals: int | None = None
+    raw: str | None = None
+    balance: str | None = None
+
+class WalletBalances(BaseModel):
+    """Schema for the ETH and ERC20 balances of a wallet."""
+    address: str
+    eth_raw: str | None = None
+    eth: str | None = None
+    tokens: list[TokenBalance] = []
+
+class WalletBalancesResponse(BaseModel):
+    """Schema for wallet balances response."""
+    wallets: list[WalletBalances]
+
 class CreateTransactionResponse(BaseModel):
     """Schema for creating a transaction response."""
     message: str
@@ -49,6 +68,7 @@ class TransactionOut(BaseModel):
     token_symbol: str | None = None
     token_decimals: int | None = None
     transaction_type: str
+    block_number: int | None = None
     transfers: list['TransferResponse'] | None = None
 
     model_config = ConfigDict(
@@ -78,3 +98,37 @@ class ValidateTransactionResponse(BaseModel):
 class AccountTransactionsResponse(BaseModel):
     """Schema for account transactions response."""
     transactions: list[TransactionOut]
+
+class AssetSummary(BaseModel):
+    """Schema for the totals of an asset sent and received by an address."""
+    asset: str
+    received_total: str
+    received_count: int
+    sent_total: str
+    sent_count: int
+    last_block: int | None = None
+
+class AddressSummaryResponse(BaseModel):
+    """Schema for address summary response."""
+    address: str
+    assets: list[AssetSummary]
+
+class PoolStats(BaseModel):
+    """Schema for connection pool statistics."""
+    status: str
+    size: int | None = None
+    checked_in: int | None = None
+    checked_out: int | None = None
+    overflow: int | None = None
+
+class LogQueueResponse(BaseModel):
+    """Schema for the log queue statistics response."""
+    enqueue: bool
+    queued: int
+    dropped: int
+
+class DatabasePoolResponse(BaseModel):
+    """Schema for database connection pools response."""
+    primary: PoolStats
+    replica: PoolStats | None = None
+    export: PoolStats
@@ -1,18 +1,98 @@
 """Session management for the application using SQLAlchemy."""
 
+from functools import lru_cache
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
 from app.core import config
 
-engine = create_engine(config.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def _create_engine(url: str, **pool_options):
+    """Create an engine using the pool settings from the configuration, overridden by pool_options."""
+    options = {"pool_pre_ping": config.DB_POOL_PRE_PING}
+    if make_url(url).get_backend_name() != "sqlite":
+        options.update(
+            pool_size=config.DB_POOL_SIZE,
+            max_overflow=config.DB_MAX_OVERFLOW,
+            pool_timeout=config.DB_POOL_TIMEOUT,
+            pool_recycle=config.DB_POOL_RECYCLE,
+            **pool_options,
+        )
+    return create_engine(url, **options)
+
+@lru_cache
+def get_engine():
+    """Get the engine of the primary database, created on first use."""
+    return _create_engine(config.DATABASE_URL)
+
+@lru_cache
+def get_read_engine():
+    """Get the engine of the read replica, or the primary one if no replica is set."""
+    if not config.DATABASE_READ_URL:
+        return get_engine()
+    return _create_engine(config.DATABASE_READ_URL)
+
+@lru_cache
+def get_export_engine():
+    """Get the engine of bulk exports, reading like get_read_engine but from a pool of its own.
+
+    Exports hold their connection for the whole download, so at most EXPORT_POOL_SIZE
+    run at once and they never take connections from the request pools.
+    """
+    return _create_engine(
+        config.DATABASE_READ_URL or config.DATABASE_URL,
+        pool_size=config.EXPORT_POOL_SIZE,
+        max_overflow=0,
+    )
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False)
+ExportSessionLocal = sessionmaker(autocommit=False, autoflush=False)
 
 Base = declarative_base()
 
+def init_db():
+    """Bind the session factories to their engines."""
+    SessionLocal.configure(bind=get_engine())
+    ReadSessionLocal.configure(bind=get_read_engine())
+    ExportSessionLocal.configure(bind=get_export_engine())
+
 def get_db():
-    """Dependency to get a database session."""
+    """Dependency to get a database session on the primary database."""
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+def get_read_db():
+    """Dependency to get a database session for read-only endpoints.
+
+    Uses the read replica when DATABASE_READ_URL is set, the primary otherwise.
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+def _pool_stats(pool) -> dict:
+    stats = {"status": pool.status()}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    return stats
+
+def pool_status() -> dict:
+    """Get connection pool statistics for the primary, replica and export engines."""
+    engine, read_engine = get_engine(), get_read_engine()
+    return {
+        "primary": _pool_stats(engine.pool),
+        "replica": _pool_stats(read_engine.pool) if read_engine is not engine else None,
+        "export": _pool_stats(get_export_engine().pool),
+    }
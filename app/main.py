@@ -1,13 +1,35 @@
 """Main application entry point for the FastAPI application."""
 
-from fastapi import FastAPI
-from app.api import wallets, transactions
-from app.db.session import engine
-from app.db import models
+import uuid
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
+from app.api import health, wallets, transactions
+from app.core import config
+from app.core.logger import logger, setup_logger, shutdown_logger
+from app.db.session import init_db
 
-app = FastAPI()
 
-models.Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    """Set up logging and validate the configuration on startup, flush queued log messages on shutdown."""
+    setup_logger()
+    config.validate()
+    init_db()
+    yield
+    shutdown_logger()
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+
+@app.middleware("http")
+async def request_id_middleware(request: Request, call_next):
+    """Attach a correlation id to every log line emitted while handling the request."""
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+    with logger.contextualize(request_id=request_id):
+        response = await call_next(request)
+    response.headers["X-Request-ID"] = request_id
+    return response
 
 app.include_router(wallets.router, prefix="/wallets")
 app.include_router(transactions.router, prefix="/transactions")
+app.include_router(health.router, prefix="/health")
@@ -1,11 +1,35 @@
 """"Test configuration for the FastAPI application."""
 
+from pathlib import Path
 import pytest
+from alembic import command
+from alembic.config import Config
 from fastapi.testclient import TestClient
+from app.db.session import SessionLocal, init_db
 from app.main import app
 
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+@pytest.fixture(scope="session", autouse=True)
+def migrate_database():
+    """Fixture to apply the database migrations before running the tests."""
+    alembic_config = Config(str(ALEMBIC_INI))
+    alembic_config.attributes["configure_logger"] = False
+    command.upgrade(alembic_config, "head")
+
 @pytest.fixture(scope="module")
 def client():
     """Fixture to create a test client for the FastAPI application."""
     with TestClient(app) as c:
         yield c
+
+@pytest.fixture
+def db():
+    """Fixture to open a session on the primary database, rolled back after the test."""
+    init_db()
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
@@ -0,0 +1,61 @@
+"""Tests for the gas limit cache."""
+
+from app.core.gas import ETH_TRANSFER_GAS, GasEstimator
+
+TOKEN_KEY = ("0x" + "11" * 20, "eoa")
+
+def _simulation(gas: int):
+    """Build a simulate callable that counts its calls."""
+    def simulate():
+        simulate.calls += 1
+        return gas
+    simulate.calls = 0
+    return simulate
+
+def test_eth_to_eoa_is_never_simulated():
+    """Test plain ETH transfers to an EOA use the fixed transfer cost."""
+    simulate = _simulation(50000)
+    assert GasEstimator(0.2).estimate(("ETH", "eoa"), simulate) == ETH_TRANSFER_GAS
+    assert simulate.calls == 0
+
+def test_eth_to_contract_is_always_simulated():
+    """Test ETH sent to contracts is simulated every time and never learned."""
+    estimator = GasEstimator(0.5)
+    estimator.observe(("ETH", "contract"), 90000)
+    assert estimator.estimate(("ETH", "contract"), _simulation(30000)) == 45000
+    assert estimator.estimate(("ETH", "contract"), _simulation(40000)) == 60000
+
+def test_token_shapes_are_cached_and_learned():
+    """Test ERC20 shapes are simulated once, then follow the highest observed gasUsed."""
+    estimator = GasEstimator(0.5)
+    simulate = _simulation(40000)
+    assert estimator.estimate(TOKEN_KEY, simulate) == 60000
+    assert estimator.estimate(TOKEN_KEY, simulate) == 60000
+    assert simulate.calls == 1
+
+    estimator.observe(TOKEN_KEY, 50000)
+    assert estimator.estimate(TOKEN_KEY, simulate) == 75000
+
+    estimator.invalidate(TOKEN_KEY)
+    assert estimator.estimate(TOKEN_KEY, simulate) == 60000
+    assert simulate.calls == 2
+
+def test_token_shape_simulated_without_cache():
+    """Test use_cache=False forces a simulation even for a cached shape."""
+    estimator = GasEstimator(0)
+    estimator.estimate(TOKEN_KEY, _simulation(40000))
+    simulate = _simulation(30000)
+    assert estimator.estimate(TOKEN_KEY, simulate, use_cache=False) == 40000
+    assert simulate.calls == 1
+
+def test_unknown_token_shape_is_simulated():
+    """Test a token transfer whose recipient balance could not be read is simulated and never learned."""
+    estimator = GasEstimator(0)
+    assert estimator.token_recipient_kind(None, "0x" + "22" * 20, None) is None
+
+    estimator.observe(None, 90000)
+    estimator.invalidate(None)
+    simulate = _simulation(40000)
+    assert estimator.estimate(None, simulate) == 40000
+    assert estimator.estimate(None, simulate) == 40000
+    assert simulate.calls == 2
@@ -0,0 +1,12 @@
+"""Tests for the health endpoints of the FastAPI application."""
+
+def test_database_pools(client):
+    """Test retrieving the database connection pool statistics."""
+    response = client.get("/health/db")
+    assert response.status_code == 200
+    data = response.json()
+
+    assert "primary" in data
+    assert "status" in data["primary"]
+    assert "replica" in data
+    assert "status" in data["export"]
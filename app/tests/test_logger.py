@@ -0,0 +1,58 @@
+"""Tests for the logger configuration."""
+
+import io
+import threading
+from fastapi.testclient import TestClient
+from app.core import config
+from app.core import logger as logger_module
+from app.core.logger import QueueSink, logger, setup_logger
+from app.main import app
+
+def test_queue_sink_survives_restart(monkeypatch, capsys):
+    """Test the queued sink is set up again on every application startup."""
+    monkeypatch.setattr(config, "LOG_ENQUEUE", True)
+    monkeypatch.setattr(config, "LOG_FORMAT", "json")
+
+    for lifespan in ("first", "second"):
+        with TestClient(app):
+            logger.info("lifespan {}", lifespan)
+
+    output = capsys.readouterr().out
+    assert "lifespan first" in output
+    assert "lifespan second" in output
+
+def test_queue_sink_reports_drops():
+    """Test messages dropped on a full queue are reported by the writer thread."""
+    release = threading.Event()
+
+    class StalledStream(io.StringIO):
+        def write(self, message):
+            release.wait(5)
+            return super().write(message)
+
+    stream = StalledStream()
+    sink = QueueSink(stream, maxsize=1)
+    for i in range(5):
+        sink.write(f"message {i}\n")
+    release.set()
+    sink.stop()
+
+    assert sink.dropped > 0
+    assert f"{sink.dropped} log messages dropped" in stream.getvalue()
+
+def test_log_queue_health(client):
+    """Test retrieving the log queue statistics."""
+    response = client.get("/health/logs")
+    assert response.status_code == 200
+    assert set(response.json()) == {"enqueue", "queued", "dropped"}
+
+def test_sample_rate_applied_on_setup(monkeypatch):
+    """Test LOG_SAMPLE_RATE is read again when the logger is set up."""
+    monkeypatch.setattr(config, "LOG_SAMPLE_RATE", 1)
+    setup_logger()
+    try:
+        assert logger_module.sampled("test") is True
+        assert logger_module.sampled("test") is False
+    finally:
+        monkeypatch.undo()
+        setup_logger()
@@ -0,0 +1,101 @@
+"""Tests for the Multicall3 batched reads, against a fake node instead of a live one."""
+
+from eth_abi import decode, encode
+from app.core import config, eth, multicall
+
+TOKEN_A = "0x" + "aa" * 20
+TOKEN_B = "0x" + "bb" * 20
+WALLET_1 = "0x" + "01" * 20
+WALLET_2 = "0x" + "02" * 20
+
+
+class FakeChain:
+    """Answers aggregate3 eth_calls from in-memory balances, one revert per (token, owner) listed."""
+
+    def __init__(self, reverts=()):
+        self.eth_balances = {WALLET_1: 10**18, WALLET_2: 2 * 10**18}
+        self.tokens = {
+            TOKEN_A: ("AAA", 6, {WALLET_1: 1_500_000, WALLET_2: 0}),
+            TOKEN_B: ("BBB", 18, {WALLET_1: 3 * 10**18, WALLET_2: 4 * 10**18}),
+        }
+        self.reverts = set(reverts)
+        self.eth_calls = 0
+        self.eth = self
+
+    def read(self, fn, hedge: bool = True):
+        return fn(self)
+
+    def call(self, tx: dict) -> bytes:
+        assert tx["to"] == multicall.MULTICALL3_ADDRESS
+        assert tx["data"][:4] == multicall.AGGREGATE3_SELECTOR
+        self.eth_calls += 1
+        (calls,) = decode(["(address,bool,bytes)[]"], tx["data"][4:])
+        returned = []
+        for target, allow_failure, data in calls:
+            assert allow_failure
+            returned.append(self._answer(target.lower(), data[:4], data[4:]))
+        return encode(["(bool,bytes)[]"], [returned])
+
+    def _answer(self, target: str, selector: bytes, arguments: bytes) -> tuple[bool, bytes]:
+        if selector == multicall.GET_ETH_BALANCE_SELECTOR:
+            (owner,) = decode(["address"], arguments)
+            return True, encode(["uint256"], [self.eth_balances[owner.lower()]])
+        symbol, decimals, balances = self.tokens[target]
+        if selector == multicall.SYMBOL_SELECTOR:
+            return True, encode(["string"], [symbol])
+        if selector == multicall.DECIMALS_SELECTOR:
+            return True, encode(["uint8"], [decimals])
+        (owner,) = decode(["address"], arguments)
+        if (target, owner.lower()) in self.reverts:
+            return False, b""
+        return True, encode(["uint256"], [balances[owner.lower()]])
+
+
+def _use(monkeypatch, chain: FakeChain) -> FakeChain:
+    monkeypatch.setattr(multicall, "get_provider_pool", lambda: chain)
+    return chain
+
+def test_reverting_call_only_fails_its_own_balance(monkeypatch):
+    """Test one reverting balanceOf nulls only its own TokenBalance, with results in call order."""
+    chain = _use(monkeypatch, FakeChain(reverts=[(TOKEN_B, WALLET_2)]))
+    balances = eth.get_balances([WALLET_1, WALLET_2], [TOKEN_A, TOKEN_B])
+
+    assert chain.eth_calls == 1
+    assert [wallet.address for wallet in balances] == [WALLET_1, WALLET_2]
+    assert [wallet.eth_raw for wallet in balances] == [str(10**18), str(2 * 10**18)]
+
+    first, second = balances
+    assert [(token.contract, token.asset, token.decimals, token.raw) for token in first.tokens] == [
+        (TOKEN_A, "AAA", 6, "1500000"),
+        (TOKEN_B, "BBB", 18, str(3 * 10**18)),
+    ]
+    assert first.tokens[0].balance == "1.5"
+    assert (second.tokens[0].raw, second.tokens[0].balance) == ("0", "0.0")
+    assert (second.tokens[1].asset, second.tokens[1].raw, second.tokens[1].balance) == ("BBB", None, None)
+
+def test_calls_are_split_by_batch_size(monkeypatch):
+    """Test MULTICALL_BATCH_SIZE splits the calls into one eth_call per batch, keeping the results."""
+    chain = _use(monkeypatch, FakeChain())
+    expected = eth.get_balances([WALLET_1, WALLET_2], [TOKEN_A, TOKEN_B])
+    assert chain.eth_calls == 1
+
+    # Two tokens times symbol and decimals, then per wallet its ETH balance and two token balances.
+    monkeypatch.setattr(config, "MULTICALL_BATCH_SIZE", 3)
+    chain = _use(monkeypatch, FakeChain())
+    assert eth.get_balances([WALLET_1, WALLET_2], [TOKEN_A, TOKEN_B]) == expected
+    assert chain.eth_calls == 4
+
+def test_undecodable_result_is_a_failure(monkeypatch):
+    """Test a call returning data that does not decode is reported as failed."""
+    _use(monkeypatch, FakeChain())
+    results = multicall.aggregate3([
+        multicall.Call(TOKEN_A, multicall.DECIMALS_SELECTOR, ("string",)),
+        multicall.decimals(TOKEN_A),
+    ])
+    assert results == [multicall.Result(False, None), multicall.Result(True, 6)]
+
+def test_token_transfer_reads_are_batched(monkeypatch):
+    """Test the reads before an ERC20 send share one eth_call, and a reverting balance is unknown."""
+    chain = _use(monkeypatch, FakeChain(reverts=[(TOKEN_B, WALLET_2)]))
+    assert eth._token_reads(TOKEN_B, WALLET_1, WALLET_2) == (18, 3 * 10**18, None)
+    assert chain.eth_calls == 1
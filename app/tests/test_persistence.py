@@ -0,0 +1,76 @@
+"""Tests for the bulk persistence of transactions and transfers."""
+
+import uuid
+from sqlalchemy import event, func, select
+from app.db import models, persistence
+
+def _item(tx_hash: str, transfers: int = 1, block_number: int = 1) -> tuple[dict, list[dict]]:
+    """Build a (transaction, transfers) pair between two fresh addresses."""
+    from_address, to_address = ("0x" + uuid.uuid4().hex.rjust(40, "0") for _ in range(2))
+    transaction = {
+        "hash": tx_hash,
+        "from_address": from_address,
+        "to_address": to_address,
+        "value": "1000",
+        "gas": 21000,
+        "gas_price": 1,
+        "receipt_status": 1,
+        "transaction_type": "eth",
+        "block_number": block_number,
+    }
+    transfer = {"asset": "ETH", "from_address": from_address, "to_address": to_address, "value": "1.5", "decimals": 18}
+    return transaction, [transfer] * transfers
+
+def _hashes(count: int) -> list[str]:
+    return [uuid.uuid4().hex * 2 for _ in range(count)]
+
+def _transfer_count(db, tx_hashes: list[str]) -> int:
+    return db.scalar(
+        select(func.count())
+        .select_from(models.Transfer)
+        .join(models.Transaction)
+        .where(models.Transaction.hash.in_(tx_hashes))
+    )
+
+def test_duplicate_hashes_are_collapsed(db):
+    """Test a hash given twice in one call is written once, with the transfers of its last occurrence."""
+    (tx_hash,) = _hashes(1)
+    inserted = persistence.upsert_transactions(db, [_item(tx_hash, transfers=1), _item(tx_hash, transfers=2)])
+
+    assert list(inserted) == [tx_hash]
+    assert db.scalar(select(func.count()).where(models.Transaction.hash == tx_hash)) == 1
+    assert _transfer_count(db, [tx_hash]) == 2
+
+def test_existing_hash_is_not_inserted_again(db):
+    """Test a second call with an already stored hash inserts nothing and returns no id."""
+    existing, new = _hashes(2)
+    first = persistence.upsert_transactions(db, [_item(existing)])
+    second = persistence.upsert_transactions(db, [_item(existing, transfers=3), _item(new, transfers=2)])
+
+    assert list(first) == [existing]
+    assert list(second) == [new]
+    assert _transfer_count(db, [existing]) == 1
+    assert _transfer_count(db, [new]) == 2
+
+def test_rows_are_split_in_batches(db, monkeypatch):
+    """Test transactions and transfers are written in statements of at most BATCH_SIZE rows."""
+    monkeypatch.setattr(persistence, "BATCH_SIZE", 2)
+    tx_hashes = _hashes(5)
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split("(")[0].strip())
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        inserted = persistence.upsert_transactions(db, [_item(tx_hash, transfers=3) for tx_hash in tx_hashes])
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert sorted(inserted) == sorted(tx_hashes)
+    assert len(set(inserted.values())) == 5
+    assert _transfer_count(db, tx_hashes) == 15
+    assert statements.count("INSERT INTO transactions") == 3
+    # Six transfers per batch of two transactions, written two at a time.
+    assert statements.count("INSERT INTO transfers") == 3 + 3 + 2
@@ -0,0 +1,173 @@
+"""Tests for the RPC provider pool, using fake endpoints instead of a live node."""
+
+import threading
+import time
+import pytest
+from web3.exceptions import TransactionNotFound
+from app.core import config
+from app.core.providers import ProviderPool
+
+def _pool(names: list[str], hedge_delay: float = 0) -> ProviderPool:
+    """Build a pool whose endpoints hand their name to fn instead of a Web3 client."""
+    pool = ProviderPool([f"http://{name}" for name in names], hedge_delay)
+    for endpoint in pool.endpoints:
+        endpoint._w3 = endpoint.name
+    return pool
+
+def test_read_fails_over_on_transport_errors(monkeypatch):
+    """Test a read moves to the next endpoint when one is unreachable."""
+    monkeypatch.setattr(config, "PROVIDER_COOLDOWN", 30)
+    pool = _pool(["down", "up"])
+    calls = []
+
+    def read(name):
+        calls.append(name)
+        if name == "down":
+            raise ConnectionError("connection refused")
+        return name
+
+    assert pool.read(read, hedge=False) == "up"
+    assert calls == ["down", "up"]
+
+    down = pool.endpoints[0]
+    assert down.errors == 1
+    assert down.down_until > time.monotonic()
+    assert [endpoint.name for endpoint in pool.ranked()] == ["up", "down"]
+
+def test_read_raises_when_every_endpoint_fails():
+    """Test a read gives up with ConnectionError once all endpoints failed."""
+    pool = _pool(["a", "b"])
+
+    def read(name):
+        raise TimeoutError(name)
+
+    with pytest.raises(ConnectionError):
+        pool.read(read, hedge=False)
+    assert all(endpoint.errors == 1 for endpoint in pool.endpoints)
+
+def test_read_passes_request_errors_through():
+    """Test errors about the request itself are raised without failover or penalty."""
+    pool = _pool(["a", "b"], hedge_delay=0.05)
+    calls = []
+
+    def read(name):
+        calls.append(name)
+        raise ValueError("execution reverted")
+
+    for hedge in (False, True):
+        with pytest.raises(ValueError):
+            pool.read(read, hedge=hedge)
+    assert calls == ["a", "a"]
+    assert all(endpoint.errors == 0 for endpoint in pool.endpoints)
+
+def test_read_is_hedged_after_the_delay():
+    """Test a slow endpoint gets the read duplicated to the next one, first answer wins."""
+    pool = _pool(["slow", "fast"], hedge_delay=0.05)
+    release = threading.Event()
+    calls = []
+
+    def read(name):
+        calls.append(name)
+        if name == "slow":
+            release.wait(5)
+        return name
+
+    try:
+        assert pool.read(read) == "fast"
+    finally:
+        release.set()
+    assert calls == ["slow", "fast"]
+
+def test_read_is_not_hedged_before_the_delay():
+    """Test a read answered within the hedge delay goes to a single endpoint."""
+    pool = _pool(["a", "b"], hedge_delay=1)
+    calls = []
+
+    def read(name):
+        calls.append(name)
+        return name
+
+    assert pool.read(read) == "a"
+    assert calls == ["a"]
+
+def test_hedged_read_fails_over_past_a_down_endpoint():
+    """Test a hedged read keeps failing over when the hedge target is down too."""
+    pool = _pool(["slow", "down", "up"], hedge_delay=0.05)
+    release = threading.Event()
+
+    def read(name):
+        if name == "slow":
+            release.wait(5)
+        if name == "down":
+            raise ConnectionError("connection refused")
+        return name
+
+    try:
+        assert pool.read(read) == "up"
+    finally:
+        release.set()
+
+def test_hedge_clock_starts_with_the_read(monkeypatch):
+    """Test a read queued behind busy reader threads is not hedged for the time spent waiting."""
+    monkeypatch.setattr(config, "PROVIDER_READ_WORKERS", 1)
+    pool = _pool(["a", "b"], hedge_delay=0.05)
+    release = threading.Event()
+    pool._readers.submit(release.wait, 5)
+    threading.Timer(0.2, release.set).start()
+    calls = []
+
+    def read(name):
+        calls.append(name)
+        return name
+
+    assert pool.read(read) == "a"
+    assert calls == ["a"]
+
+def test_read_is_not_hedged_without_free_hedge_workers(monkeypatch):
+    """Test hedges are skipped, not queued, when every hedge worker is busy."""
+    monkeypatch.setattr(config, "PROVIDER_HEDGE_WORKERS", 1)
+    pool = _pool(["slow", "fast"], hedge_delay=0.05)
+    calls = []
+
+    def read(name):
+        calls.append(name)
+        time.sleep(0.15)
+        return name
+
+    assert pool._hedge_slots.acquire(blocking=False)
+    try:
+        assert pool.read(read) == "slow"
+    finally:
+        pool._hedge_slots.release()
+    assert calls == ["slow"]
+
+def test_hedged_not_found_waits_for_the_other_endpoint():
+    """Test a lagging hedge target answering not found does not beat a slower endpoint that has the data."""
+    pool = _pool(["slow", "lagging"], hedge_delay=0.05)
+
+    def read(name):
+        if name == "lagging":
+            raise TransactionNotFound("not found")
+        time.sleep(0.15)
+        return name
+
+    assert pool.read(read) == "slow"
+
+def test_failover_asks_the_next_endpoint_on_not_found():
+    """Test a not found answer is retried on the next endpoint, and raised once none has the data."""
+    pool = _pool(["lagging", "synced"])
+
+    def read(name):
+        if name == "lagging":
+            raise TransactionNotFound("not found")
+        return name
+
+    assert pool.read(read, hedge=False) == "synced"
+    assert all(endpoint.errors == 0 for endpoint in pool.endpoints)
+
+    def missing(name):
+        raise TransactionNotFound(name)
+
+    for hedge in (False, True):
+        with pytest.raises(TransactionNotFound):
+            pool.read(missing, hedge=hedge)
@@ -0,0 +1,59 @@
+"""Tests for the single-flight coalescing of in-flight calls."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from app.core.singleflight import SingleFlight
+
+def _run_concurrently(flight: SingleFlight, fn, callers: int = 4) -> list:
+    """Start callers that share one key while the leader is blocked in fn."""
+    release = threading.Event()
+    calls = []
+
+    def blocked():
+        calls.append(1)
+        release.wait(5)
+        return fn()
+
+    def attempt():
+        try:
+            return flight.do("key", blocked)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=callers) as executor:
+        futures = [executor.submit(attempt) for _ in range(callers)]
+        while flight.shared < callers - 1:
+            threading.Event().wait(0.001)
+        release.set()
+        results = [future.result() for future in futures]
+    assert len(calls) == 1
+    return results
+
+def test_followers_share_the_leader_result():
+    """Test concurrent callers of a key run the function once and get its result."""
+    flight = SingleFlight()
+    assert _run_concurrently(flight, lambda: 42) == [42] * 4
+    assert flight.shared == 3
+
+def test_followers_share_the_leader_exception():
+    """Test concurrent callers of a key all receive the exception of the leader."""
+    error = ValueError("execution reverted")
+
+    def fail():
+        raise error
+
+    results = _run_concurrently(SingleFlight(), fail)
+    assert all(result is error for result in results)
+
+def test_key_is_released_after_the_call():
+    """Test nothing is cached once the call completes, whatever its outcome."""
+    flight = SingleFlight()
+    values = iter([1, 2])
+    assert flight.do("key", lambda: next(values)) == 1
+    assert flight.do("key", lambda: next(values)) == 2
+
+    with pytest.raises(ValueError):
+        flight.do("key", lambda: int("x"))
+    assert flight.do("key", lambda: 3) == 3
+    assert not flight._calls
@@ -1,6 +1,18 @@
 """Tests for the transactions endpoint of the FastAPI application."""
 
+import csv
+import io
+import json
 import os
+import uuid
+from datetime import date, datetime
+import anyio
+import pytest
+from sqlalchemy import exc
+from app.core import config
+from app.db import export, models, persistence
+from app.db.session import get_export_engine
+from app.main import app
 
 ETH_TX_HASH = os.getenv("ETH_TX_HASH")
 ERC20_TX_HASH = os.getenv("ERC20_TX_HASH")
@@ -11,6 +23,9 @@ ACC2_ADDRESS = os.getenv("ACC2_ADDRESS")
 CONTRACT_ADDRESS = os.getenv("CONTRACT_ADDRESS")
 CONTRACT_ASSET = os.getenv("CONTRACT_ASSET")
 
+ACCOUNT = "0x" + "ab" * 20
+OTHER_ACCOUNT = "0x" + "cd" * 20
+
 def test_get_eth_transaction(client):
     """Test retrieving a ethereum transaction by hash."""
 
@@ -125,3 +140,126 @@ def test_validate_transaction_not_found(client):
     assert response.status_code == 400
     data = response.json()
     assert "detail" in data
+
+def test_get_account_transactions_not_found(client):
+    """Test retrieving the transactions of an account without transactions."""
+    response = client.get("/transactions/account", params={"address": "0x" + "00" * 20})
+    assert response.status_code == 404
+    data = response.json()
+    assert "detail" in data
+    assert data["detail"] == "No transactions found for this account"
+
+@pytest.fixture
+def exported(db):
+    """Fixture to store three transactions of two transfers each, a day apart, and return their ids."""
+    ids = []
+    for day in (1, 2, 3):
+        tx_hash = uuid.uuid4().hex * 2
+        transaction = {
+            "hash": tx_hash,
+            "from_address": ACCOUNT,
+            "to_address": OTHER_ACCOUNT,
+            "value": "0",
+            "gas": 60000,
+            "gas_price": 1,
+            "receipt_status": 1,
+            "transaction_type": "erc20",
+            "block_number": day,
+        }
+        transfers = [
+            {"asset": asset, "from_address": ACCOUNT, "to_address": OTHER_ACCOUNT, "value": str(day), "decimals": 18}
+            for asset in ("ETH", "TKN")
+        ]
+        (tx_id,) = persistence.upsert_transactions(db, [(transaction, transfers)]).values()
+        db.query(models.Transaction).filter(models.Transaction.id == tx_id).update(
+            {models.Transaction.created_at: datetime(2020, 1, day)}
+        )
+        ids.append(tx_id)
+    db.commit()
+    return ids
+
+def test_export_transactions(client, exported):
+    """Test exporting the transaction history as CSV, one row per transfer."""
+    response = client.get("/transactions/export", params={
+        "format": "csv", "start_id": exported[0], "end_id": exported[-1] + 1,
+    })
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [(int(row["transaction_id"]), row["asset"]) for row in rows] == [
+        (tx_id, asset) for tx_id in exported for asset in ("ETH", "TKN")
+    ]
+    assert rows[0]["from_address"] == ACCOUNT
+    assert rows[0]["value"] == "1"
+    assert rows[-1]["block_number"] == "3"
+
+def test_export_transactions_ranges(client, exported):
+    """Test the id and time bounds are inclusive on the start and exclusive on the end."""
+    by_id = client.get("/transactions/export", params={"start_id": exported[1], "end_id": exported[2]})
+    by_time = client.get("/transactions/export", params={
+        "start_id": exported[0],
+        "end_id": exported[-1] + 1,
+        "since": "2020-01-02T00:00:00",
+        "until": "2020-01-03T00:00:00",
+    })
+    for response in (by_id, by_time):
+        assert response.status_code == 200
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["transaction_id"] for row in rows] == [exported[1], exported[1]]
+
+def test_export_transactions_parquet(client, exported):
+    """Test the Parquet export reads back with the exported rows."""
+    import pyarrow.parquet as pq
+
+    response = client.get("/transactions/export", params={
+        "format": "parquet", "start_id": exported[0], "end_id": exported[-1] + 1,
+    })
+    assert response.status_code == 200
+
+    table = pq.read_table(io.BytesIO(response.content))
+    assert table.num_rows == 6
+    assert table.column("transaction_id").to_pylist() == [tx_id for tx_id in exported for _ in range(2)]
+    assert table.column("created_at").to_pylist()[0].date() == date(2020, 1, 1)
+
+def test_export_releases_connection_on_disconnect(client, exported, monkeypatch):
+    """Test a client disconnecting mid-export gives the connection back to the export pool."""
+    monkeypatch.setattr(config, "EXPORT_BATCH_SIZE", 1)
+    query = f"format=csv&start_id={exported[0]}&end_id={exported[-1] + 1}".encode()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/transactions/export", "raw_path": b"/transactions/export",
+        "root_path": "", "query_string": query, "headers": [], "client": ("test", 1), "server": ("test", 80),
+    }
+
+    async def download_first_chunk():
+        disconnected = anyio.Event()
+
+        async def receive():
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.body":
+                disconnected.set()
+
+        await app(scope, receive, send)
+
+    anyio.run(download_first_chunk)
+    assert get_export_engine().pool.checkedout() == 0
+
+def test_export_transactions_pool_exhausted(client, monkeypatch):
+    """Test exporting while every export connection is in use."""
+    def exhausted():
+        raise exc.TimeoutError("QueuePool limit reached")
+
+    monkeypatch.setattr(export, "open_session", exhausted)
+    response = client.get("/transactions/export")
+    assert response.status_code == 503
+    assert "detail" in response.json()
+
+def test_export_transactions_invalid_format(client):
+    """Test exporting the transaction history with an unsupported format."""
+    response = client.get("/transactions/export", params={"format": "xml"})
+    assert response.status_code == 400
+    assert "detail" in response.json()
@@ -1,5 +1,10 @@
 """Tests for the wallets endpoint of the FastAPI application."""
 
+import sys
+import uuid
+from web3 import Web3
+from app.db import aggregates, models, persistence
+
 def test_create_wallets(client):
     """Test creating multiple wallets."""
     response = client.post("/wallets/", params={"qtd": 2})
@@ -12,3 +17,139 @@ def test_list_wallets(client):
     response = client.get("/wallets/")
     assert response.status_code == 200
     assert isinstance(response.json(), list)
+
+def test_request_id_header(client):
+    """Test the correlation id is echoed back in the response headers."""
+    response = client.get("/wallets/", headers={"X-Request-ID": "test-request-id"})
+    assert response.status_code == 200
+    assert response.headers["X-Request-ID"] == "test-request-id"
+
+def test_get_wallet_balances(client):
+    """Test retrieving the balances of all wallets."""
+    response = client.get("/wallets/balances")
+    assert response.status_code == 200
+    data = response.json()
+
+    assert "wallets" in data
+    assert isinstance(data["wallets"], list)
+    for wallet in data["wallets"]:
+        assert "address" in wallet
+        assert "eth" in wallet
+        assert "tokens" in wallet
+
+def test_get_wallet_balances_invalid_token(client):
+    """Test retrieving wallet balances with an invalid token address."""
+    response = client.get("/wallets/balances", params={"tokens": "0xdeadbeef"})
+    assert response.status_code == 400
+    assert "detail" in response.json()
+
+def test_get_address_summary_not_found(client):
+    """Test retrieving the summary of an address without transfers."""
+    response = client.get(f"/wallets/{'0x' + '00' * 20}/summary")
+    assert response.status_code == 404
+    data = response.json()
+    assert "detail" in data
+    assert data["detail"] == "No transfers found for this address"
+
+def _transfer_item(tx_hash, from_address, to_address, asset, value, block_number, token_contract=None):
+    """Build a (transaction, transfers) pair with a single transfer."""
+    transaction = {
+        "hash": tx_hash,
+        "from_address": from_address,
+        "to_address": to_address,
+        "value": "0",
+        "gas": 21000,
+        "gas_price": 1,
+        "receipt_status": 1,
+        "token_contract": token_contract,
+        "transaction_type": "erc20" if token_contract else "eth",
+        "block_number": block_number,
+    }
+    transfer = {"asset": asset, "from_address": from_address, "to_address": to_address, "value": value, "decimals": 18}
+    return transaction, [transfer]
+
+def _rebuild_aggregates(monkeypatch):
+    """Run the rebuild command line."""
+    monkeypatch.setattr(sys, "argv", ["app.db.aggregates", "rebuild"])
+    aggregates.main()
+
+def _random_address() -> str:
+    return Web3.to_checksum_address("0x" + uuid.uuid4().hex.rjust(40, "0"))
+
+def test_get_address_summary(client, db, monkeypatch):
+    """Test the address summary follows ingested transfers and matches a rebuild from them."""
+    address, other = _random_address(), _random_address()
+    token = "0x" + "12" * 20
+
+    hashes = [uuid.uuid4().hex * 2 for _ in range(4)]
+    items = [
+        _transfer_item(hashes[0], other, address, "ETH", "1.5", 7),
+        _transfer_item(hashes[1], other, address, "ETH", "2.25", 3),
+        _transfer_item(hashes[2], address, other, "ETH", "0.75", None),
+        _transfer_item(hashes[3], address, other, "TKN", "10", 5, token_contract=token),
+    ]
+    persistence.upsert_transactions(db, items[:2])
+    db.commit()
+    persistence.upsert_transactions(db, items)
+    db.commit()
+
+    expected = {
+        "address": address,
+        "assets": [
+            {"asset": token, "received_total": "0", "received_count": 0,
+             "sent_total": "10", "sent_count": 1, "last_block": 5},
+            {"asset": "ETH", "received_total": "3.75", "received_count": 2,
+             "sent_total": "0.75", "sent_count": 1, "last_block": 7},
+        ],
+    }
+    response = client.get(f"/wallets/{address}/summary")
+    assert response.status_code == 200
+    assert response.json() == expected
+
+    db.query(models.AddressAggregate).filter(models.AddressAggregate.address == address.lower()).delete()
+    db.commit()
+    assert client.get(f"/wallets/{address}/summary").status_code == 404
+
+    _rebuild_aggregates(monkeypatch)
+    response = client.get(f"/wallets/{address}/summary")
+    assert response.status_code == 200
+    assert response.json() == expected
+
+def test_get_address_summary_mixed_case(client, db, monkeypatch):
+    """Test transfers written with differently cased addresses and assets add up to one row per asset."""
+    address, other = _random_address(), _random_address()
+    token = Web3.to_checksum_address("0x" + "34" * 20)
+
+    hashes = [uuid.uuid4().hex * 2 for _ in range(4)]
+    persistence.upsert_transactions(db, [
+        # Validated transactions carry checksummed addresses, the token symbol and the checksummed contract.
+        _transfer_item(hashes[0], other, address, "ETH", "1", 1),
+        _transfer_item(hashes[1], other, address, "TKN", "2", 2, token_contract=token),
+        # Created transactions carry the addresses and the asset as the user typed them.
+        _transfer_item(hashes[2], other.lower(), address.lower(), "eth", "3", 3),
+        _transfer_item(hashes[3], other.lower(), address.lower(), "tkn", "4", 4, token_contract=token.lower()),
+    ])
+    db.commit()
+
+    expected = {
+        "address": address,
+        "assets": [
+            {"asset": token.lower(), "received_total": "6", "received_count": 2,
+             "sent_total": "0", "sent_count": 0, "last_block": 4},
+            {"asset": "ETH", "received_total": "4", "received_count": 2,
+             "sent_total": "0", "sent_count": 0, "last_block": 3},
+        ],
+    }
+    for spelling in (address, address.lower(), "0x" + address[2:].upper()):
+        response = client.get(f"/wallets/{spelling}/summary")
+        assert response.status_code == 200
+        assert response.json() == expected
+
+    _rebuild_aggregates(monkeypatch)
+    assert client.get(f"/wallets/{address.lower()}/summary").json() == expected
+
+def test_get_address_summary_invalid_address(client):
+    """Test retrieving the summary of a malformed address."""
+    response = client.get("/wallets/0xdeadbeef/summary")
+    assert response.status_code == 400
+    assert "detail" in response.json()
@@ -0,0 +1 @@
+"""Micro-benchmarks for the application hot paths."""
@@ -0,0 +1,37 @@
+"""Benchmark the cold import time of the application.
+
+Run with ``python -m benchmarks.bench_import``. Each measurement spawns a fresh
+interpreter, so nothing is shared between runs through ``sys.modules``.
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+RUNS = 7
+
+SCENARIOS = [
+    ("import app.main", "import app.main"),
+    ("import app.main + chain libraries", "import app.main, web3, eth_account, Crypto.Cipher.AES"),
+]
+
+def _measure(code: str) -> float:
+    env = {**os.environ, "DATABASE_URL": os.getenv("DATABASE_URL", "sqlite://"), "AES_KEY": "00" * 32}
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], env=env, check=True)
+    return time.perf_counter() - start
+
+def main():
+    """Run every scenario and print the median wall time."""
+    _measure("pass")
+    baseline = statistics.median(_measure("pass") for _ in range(RUNS))
+    print(f"{'interpreter startup':<40} {baseline * 1000:8.1f} ms")
+
+    for name, code in SCENARIOS:
+        elapsed = statistics.median(_measure(code) for _ in range(RUNS))
+        print(f"{name:<40} {elapsed * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark the caller-side overhead of the logging configurations.
+
+Run with ``python -m benchmarks.bench_logging``. Every scenario logs the same
+per-receipt-log message used in ``eth.validate_transaction``, once to
+``os.devnull`` and once to a sink that stalls on every write, emulating stdout
+backpressure from a slow log collector.
+"""
+
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("AES_KEY", "00" * 32)
+
+from loguru import logger  # noqa: E402
+from app.core.logger import TEXT_FORMAT, LogSampler, QueueSink  # noqa: E402
+
+ITERATIONS = 5_000
+STALL_SECONDS = 0.0001
+TX_HASH = bytes(range(32))
+
+
+class StalledSink:
+    """File-like sink that blocks on every write."""
+
+    def write(self, message):
+        """Discard the message after a short stall."""
+        time.sleep(STALL_SECONDS)
+
+    def flush(self):
+        """Nothing to flush."""
+
+
+def _text_sync(sink):
+    logger.add(sink, level="INFO", format=TEXT_FORMAT, colorize=True)
+
+def _json_sync(sink):
+    logger.add(sink, level="INFO", serialize=True)
+
+_queue_sinks: list[QueueSink] = []
+
+def _json_enqueue(sink):
+    _queue_sinks.append(QueueSink(sink, ITERATIONS))
+    logger.add(_queue_sinks[-1], level="INFO", serialize=True)
+
+def _eager(_sampler):
+    for _ in range(ITERATIONS):
+        logger.info(f"Log {TX_HASH.hex()} is not a transfer event, skipping")
+
+def _lazy(_sampler):
+    for _ in range(ITERATIONS):
+        logger.info("Log {} is not a transfer event, skipping", TX_HASH)
+
+def _lazy_sampled(sampler):
+    for _ in range(ITERATIONS):
+        if sampler.allow("receipt_log_skipped"):
+            logger.info("Log {} is not a transfer event, skipping", TX_HASH)
+
+def _lazy_disabled(_sampler):
+    for _ in range(ITERATIONS):
+        logger.debug("Log {} is not a transfer event, skipping", TX_HASH)
+
+
+SCENARIOS = [
+    ("text sync, eager f-string (baseline)", _text_sync, _eager),
+    ("text sync, lazy", _text_sync, _lazy),
+    ("json sync, lazy", _json_sync, _lazy),
+    ("json enqueue, lazy", _json_enqueue, _lazy),
+    ("json enqueue, lazy + sampled (10/s)", _json_enqueue, _lazy_sampled),
+    ("json enqueue, below level", _json_enqueue, _lazy_disabled),
+]
+
+def main():
+    """Run every scenario and print the per-call cost seen by the caller."""
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        for sink_name, sink in (("devnull", devnull), ("stalled", StalledSink())):
+            print(f"sink: {sink_name}")
+            for name, configure, emit in SCENARIOS:
+                logger.remove()
+                logger.configure(extra={"request_id": "bench"})
+                configure(sink)
+                sampler = LogSampler(10)
+
+                start = time.perf_counter()
+                emit(sampler)
+                elapsed = time.perf_counter() - start
+
+                logger.remove()
+                while _queue_sinks:
+                    _queue_sinks.pop().stop()
+                print(f"  {name:<40} {elapsed / ITERATIONS * 1e6:8.2f} us/call")
+
+if __name__ == "__main__":
+    main()
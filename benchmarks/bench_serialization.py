@@ -0,0 +1,123 @@
+"""Benchmark the list endpoints response paths.
+
+Run with ``python -m benchmarks.bench_serialization``. For the account
+transactions at 10k rows, both paths read the same in-memory SQLite database:
+the previous one loads ORM objects, validates them into pydantic models and
+encodes them with FastAPI's default JSON response, the current one goes from
+row tuples to bytes with orjson. For the wallets listing at 1k rows, the
+private key check is timed apart from the serialization.
+"""
+
+import asyncio
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("AES_KEY", "00" * 32)
+
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session, selectinload  # noqa: E402
+from app.core import eth, utils  # noqa: E402
+from app.db import models, queries, schemas  # noqa: E402
+
+ROWS = 10_000
+WALLET_ROWS = 1_000
+RUNS = 5
+ADDRESS = "0x" + "ab" * 20
+
+
+def _populate(db: Session):
+    for i in range(ROWS):
+        transaction = models.Transaction(
+            hash=f"{i:064x}",
+            from_address=ADDRESS,
+            to_address="0x" + "cd" * 20,
+            value="1000000000000000000",
+            gas=21000,
+            gas_price=1_000_000_000,
+            input_data=None,
+            receipt_status=1,
+            transaction_type="eth",
+        )
+        transaction.transfers.append(models.Transfer(
+            asset="ETH",
+            from_address=ADDRESS,
+            to_address="0x" + "cd" * 20,
+            value="1.0",
+            decimals=18,
+        ))
+        db.add(transaction)
+    db.commit()
+
+def _orm_pydantic(db: Session) -> bytes:
+    transactions = db.query(models.Transaction).options(
+        selectinload(models.Transaction.transfers)
+    ).filter(
+        (models.Transaction.from_address == ADDRESS) |
+        (models.Transaction.to_address == ADDRESS)
+    ).all()
+    content = schemas.AccountTransactionsResponse(transactions=transactions)
+    field = create_response_field(name="Response", type_=schemas.AccountTransactionsResponse)
+    encoded = asyncio.run(serialize_response(field=field, response_content=content, is_coroutine=False))
+    return JSONResponse(encoded).body
+
+def _rows_orjson(db: Session) -> bytes:
+    return ORJSONResponse({"transactions": queries.account_transactions(db, ADDRESS)}).body
+
+def _populate_wallets(db: Session):
+    for _ in range(WALLET_ROWS):
+        address, private_key = eth.create_wallet()
+        db.add(models.Wallet(address=address, private_key=utils.encrypt_private_key(private_key)))
+    db.commit()
+
+def _wallet_keys_web3(db: Session) -> bytes:
+    from web3 import Web3
+
+    for _, address, private_key in queries.wallets(db):
+        decrypted_key = utils.decrypt_private_key(private_key)
+        assert Web3.to_checksum_address(Web3().eth.account.from_key(decrypted_key).address) == address
+    return b""
+
+def _wallet_keys_account(db: Session) -> bytes:
+    from eth_account import Account
+
+    for _, address, private_key in queries.wallets(db):
+        assert Account.from_key(utils.decrypt_private_key(private_key)).address == address
+    return b""
+
+def _wallet_rows_orjson(db: Session) -> bytes:
+    return ORJSONResponse([{"id": wallet_id, "address": address} for wallet_id, address, _ in queries.wallets(db)]).body
+
+def _run(engine, paths):
+    for name, path in paths:
+        timings = []
+        for _ in range(RUNS):
+            with Session(engine) as db:
+                start = time.perf_counter()
+                body = path(db)
+                timings.append(time.perf_counter() - start)
+        timings.sort()
+        print(f"{name:<30} {timings[RUNS // 2] * 1000:8.1f} ms  ({len(body) / 1e6:.1f} MB)")
+
+def main():
+    """Run every path and print the median time per response."""
+    engine = create_engine("sqlite://")
+    models.Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        _populate(db)
+        _populate_wallets(db)
+
+    print(f"GET /transactions/account, {ROWS} rows")
+    _run(engine, (("orm + pydantic + json", _orm_pydantic), ("rows + orjson", _rows_orjson)))
+    print(f"GET /wallets/, {WALLET_ROWS} rows")
+    _run(engine, (
+        ("key check, Web3() per row", _wallet_keys_web3),
+        ("key check, Account", _wallet_keys_account),
+        ("rows + orjson", _wallet_rows_orjson),
+    ))
+
+if __name__ == "__main__":
+    main()
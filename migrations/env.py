@@ -0,0 +1,42 @@
+"""Alembic environment for the application database."""
+
+from logging.config import fileConfig
+from alembic import context
+from app.core import config as app_config
+from app.db import models
+from app.db.session import get_engine
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = models.Base.metadata
+
+
+def run_migrations_offline():
+    """Emit the migration SQL without connecting to the database."""
+    context.configure(
+        url=app_config.DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online():
+    """Run the migrations against the configured database."""
+    with get_engine().connect() as connection:
+        context.configure(connection=connection, target_metadata=target_metadata, render_as_batch=True)
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+app_config.validate()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
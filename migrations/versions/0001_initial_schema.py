@@ -0,0 +1,72 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 19:52:08.919111
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('wallets',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('address', sa.String(), nullable=False),
+    sa.Column('private_key', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_wallets_address'), 'wallets', ['address'], unique=True)
+    op.create_index(op.f('ix_wallets_id'), 'wallets', ['id'], unique=False)
+
+    op.create_table('transactions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('hash', sa.String(), nullable=False),
+    sa.Column('from_address', sa.String(), nullable=False),
+    sa.Column('to_address', sa.String(), nullable=True),
+    sa.Column('value', sa.String(), nullable=False),
+    sa.Column('gas', sa.Integer(), nullable=False),
+    sa.Column('gas_price', sa.Integer(), nullable=False),
+    sa.Column('input_data', sa.String(), nullable=True),
+    sa.Column('receipt_status', sa.Integer(), nullable=False),
+    sa.Column('token_contract', sa.String(), nullable=True),
+    sa.Column('token_symbol', sa.String(), nullable=True),
+    sa.Column('token_decimals', sa.Integer(), nullable=True),
+    sa.Column('transaction_type', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_transactions_hash'), 'transactions', ['hash'], unique=True)
+    op.create_index(op.f('ix_transactions_id'), 'transactions', ['id'], unique=False)
+
+    op.create_table('transfers',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('transaction_id', sa.Integer(), nullable=False),
+    sa.Column('asset', sa.String(), nullable=False),
+    sa.Column('from_address', sa.String(), nullable=False),
+    sa.Column('to_address', sa.String(), nullable=False),
+    sa.Column('value', sa.String(), nullable=False),
+    sa.Column('decimals', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['transaction_id'], ['transactions.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_transfers_id'), 'transfers', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_transfers_id'), table_name='transfers')
+    op.drop_table('transfers')
+    op.drop_index(op.f('ix_transactions_id'), table_name='transactions')
+    op.drop_index(op.f('ix_transactions_hash'), table_name='transactions')
+    op.drop_table('transactions')
+    op.drop_index(op.f('ix_wallets_id'), table_name='wallets')
+    op.drop_index(op.f('ix_wallets_address'), table_name='wallets')
+    op.drop_table('wallets')
@@ -0,0 +1,40 @@
+"""address aggregates
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 19:59:49.267825
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('address_aggregates',
+    sa.Column('address', sa.String(), nullable=False),
+    sa.Column('asset', sa.String(), nullable=False),
+    sa.Column('received_total', sa.Numeric(precision=78, scale=18), nullable=False),
+    sa.Column('received_count', sa.Integer(), nullable=False),
+    sa.Column('sent_total', sa.Numeric(precision=78, scale=18), nullable=False),
+    sa.Column('sent_count', sa.Integer(), nullable=False),
+    sa.Column('last_block', sa.Integer(), nullable=True),
+    sa.PrimaryKeyConstraint('address', 'asset')
+    )
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('block_number', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('transactions', schema=None) as batch_op:
+        batch_op.drop_column('block_number')
+
+    op.drop_table('address_aggregates')